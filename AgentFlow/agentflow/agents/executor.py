@@ -1,16 +1,82 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import re
+import logging
+from agentflow.llm import get_llm
 from agentflow.graph.state import AgentState
+from agentflow.graph.streaming import stream_text
+from agentflow.context import compact_research, node_budget
+
+logger = logging.getLogger(__name__)
+
+EDIT_BLOCK = re.compile(r"<<<<<<< FIND\n(.*?)\n=======\n(.*?)\n>>>>>>> REPLACE", re.DOTALL)
+
+def apply_edits(draft: str, response: str):
+    """
+    Applies FIND/REPLACE edit blocks to the draft. Returns (new_draft, applied)
+    or (None, 0) when the response contains no edit blocks at all.
+    """
+    blocks = EDIT_BLOCK.findall(response)
+    if not blocks:
+        return None, 0
+    applied = 0
+    for find, replace in blocks:
+        if find and find in draft:
+            draft = draft.replace(find, replace, 1)
+            applied += 1
+        elif not find.strip():
+            # Empty FIND means append
+            draft = draft.rstrip() + "\n\n" + replace
+            applied += 1
+    return draft, applied
+
+def revise_draft(state: AgentState, llm):
+    """Asks for targeted edits to the existing draft instead of regenerating it."""
+    draft_output = state["draft_output"]
+    issues = state.get("feedback_issues") or [state.get("validation_feedback", "")]
+    
+    prompt = f"""You are an Executor Agent revising your own draft.
+Objective: {state["user_goal"]}
+Current Draft:
+{draft_output}
+
+Reviewer Issues:
+{chr(10).join(f"- {i}" for i in issues)}
+
+Fix only what the issues require and keep everything else unchanged.
+Reply with one or more edit blocks and nothing else:
+<<<<<<< FIND
+exact text copied from the current draft
+=======
+replacement text
+>>>>>>> REPLACE
+Use an empty FIND section to append new content at the end.
+"""
+    
+    response = llm.invoke(prompt)
+    revised, applied = apply_edits(draft_output, response.content)
+    if revised is None:
+        # Model ignored the edit format: treat the reply as a full rewrite
+        return response.content
+    if applied == 0:
+        logger.warning("Executor revision produced no applicable edits; keeping previous draft.")
+    return revised
 
 def executor_agent(state: AgentState):
     """
     Executor Agent: Produces final output based on plan and research.
     """
-    print("--- EXECUTOR ---")
+    logger.debug("--- EXECUTOR ---")
     user_goal = state["user_goal"]
     plan = state["plan"]
-    research_notes = state["research_notes"]
+    # Notes grow with every gap-research retry; keep what's relevant to each plan step within budget
+    research_notes = compact_research(state["research_notes"], plan, user_goal, node_budget("executor"))
+    
+    llm = get_llm("executor", temperature=0.7)
     
-    llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.7)
+    # Validator sent the draft back to us: revise it rather than start over
+    if state.get("revision_target") == "executor" and state.get("draft_output"):
+        return {
+            "draft_output": revise_draft(state, llm)
+        }
     
     prompt = f"""You are an Executor Agent.
 Objective: {user_goal}
@@ -20,8 +86,9 @@ Research Findings: {research_notes}
 Based on the research and the plan, produce the final high-quality output.
 """
     
-    response = llm.invoke(prompt)
+    # Tokens go out on the "custom" stream channel as they are generated
+    content = stream_text(llm, prompt, "executor")
     
     return {
-        "draft_output": response.content
+        "draft_output": content
     }
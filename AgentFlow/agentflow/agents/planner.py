@@ -1,16 +1,19 @@
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+import logging
+from agentflow.llm import get_llm
 from agentflow.graph.state import AgentState
 
+logger = logging.getLogger(__name__)
+
 def planner_agent(state: AgentState):
     """
     Planner Agent: Breaks user goal into structured steps.
     """
-    print("--- PLANNER ---")
+    logger.debug("--- PLANNER ---")
     user_goal = state["user_goal"]
     
-    # Using Google Gemini
-    llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
+    # Shared Gemini client (model from AGENTFLOW_MODEL / AGENTFLOW_PLANNER_MODEL)
+    llm = get_llm("planner", temperature=0)
     
     prompt = f"""You are a Strategic Planner Agent.
 Your goal is to break down the following high-level objective into 3-5 logical steps for a multi-agent team.
@@ -18,6 +21,15 @@ Objective: {user_goal}
 
 Format your response as a JSON list of strings.
 Example: ["Step 1", "Step 2", "Step 3"]
+"""
+    # Re-planning after the validator rejected the overall approach
+    if state.get("revision_target") == "planner" and state.get("plan"):
+        issues = "\n".join(f"- {i}" for i in state.get("feedback_issues") or [])
+        prompt += f"""
+The previous plan was rejected: {", ".join(state["plan"])}
+Reviewer issues:
+{issues}
+Produce a corrected plan that addresses them.
 """
     
     response = llm.invoke(prompt)
@@ -28,10 +40,12 @@ Example: ["Step 1", "Step 2", "Step 3"]
             content = content.split("```json")[1].split("```")[0].strip()
         plan = json.loads(content)
     except Exception as e:
-        print(f"Error parsing plan: {e}")
+        logger.warning("Error parsing plan: %s", e)
         plan = [f"Step 1: Explore {user_goal}", "Step 2: Execute", "Step 3: Validate"]
 
     return {
         "plan": plan,
-        "current_step": 0
+        "current_step": 0,
+        # A new plan invalidates downstream work: researcher and executor start fresh
+        "revision_target": None
     }
@@ -1,28 +1,83 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from agentflow.config import env_int
+from agentflow.context import node_budget, summarize
+from agentflow.llm import get_llm
 from agentflow.graph.state import AgentState
+from agentflow.graph.streaming import stream_text, token_writer
+from agentflow.tools import gather_context
+
+logger = logging.getLogger(__name__)
 
 def researcher_agent(state: AgentState):
     """
     Researcher Agent: Gathers facts and context based on the plan.
     """
-    print("--- RESEARCHER ---")
+    logger.debug("--- RESEARCHER ---")
     plan = state["plan"]
     user_goal = state["user_goal"]
     
-    llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
+    llm = get_llm("researcher", temperature=0)
     
-    # Simulate research by summarizing what needs to be found for the plan.
-    # In production, this would use TavilySearch or other tools.
-    prompt = f"""You are a Researcher Agent.
+    # Validator found evidence gaps: research only those and extend the existing notes
+    if state.get("revision_target") == "researcher" and state.get("research_notes"):
+        issues = "\n".join(f"- {i}" for i in state.get("feedback_issues") or [])
+        prompt = f"""You are a Researcher Agent.
 The team is working on the following goal: {user_goal}
 The plan is: {", ".join(plan)}
 
-Gather detailed context and facts needed to complete this plan. 
-Provide a comprehensive summary of findings that the Executor agent can use.
+A reviewer found these gaps in the evidence behind the current draft:
+{issues}
+
+Gather only the additional facts needed to close these gaps. Do not repeat existing findings.
 """
+        additions = stream_text(llm, prompt, "researcher")
+        return {
+            "research_notes": state["research_notes"] + "\n\n## Additional Findings\n" + additions,
+            # New evidence: the executor rewrites the draft rather than patching it
+            "revision_target": None
+        }
     
-    response = llm.invoke(prompt)
+    # One research task per plan step, run in parallel and reduced into a single set of notes.
+    # Wall-clock time is bounded by the slowest step instead of one giant prompt.
+    steps = plan or [user_goal]
+    emit = token_writer("researcher")
+    findings = [None] * len(steps)
+    workers = max(1, min(len(steps), env_int("AGENTFLOW_RESEARCH_CONCURRENCY", 4)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="researcher") as pool:
+        # Copy the node's context into each task so per-run settings (e.g. cache bypass) still apply
+        futures = {
+            pool.submit(contextvars.copy_context().run, research_step, llm, user_goal, plan, step): i
+            for i, step in enumerate(steps)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                findings[i] = future.result()
+            except Exception as e:
+                logger.error("Research failed for step '%s': %s", steps[i], e)
+                findings[i] = f"(research unavailable: {e})"
+            # Each finished step goes out on the stream channel as soon as it is ready
+            emit(f"### {steps[i]}\n{findings[i]}\n\n")
     
     return {
-        "research_notes": response.content
+        "research_notes": "\n\n".join(f"### {step}\n{notes}" for step, notes in zip(steps, findings))
     }
+
+def research_step(llm, user_goal, plan, step):
+    """Researches a single plan step, using any registered per-step tools for extra context."""
+    context = gather_context(step, user_goal)
+    if context:
+        context = summarize(context, node_budget("researcher"), f"{step} {user_goal}")
+    
+    # Without tools this is the model's own knowledge; tools add search results etc.
+    prompt = f"""You are a Researcher Agent.
+The team is working on the following goal: {user_goal}
+The full plan is: {", ".join(plan)}
+Your assigned step: {step}
+{f"Source material:{chr(10)}{context}{chr(10)}" if context else ""}
+Gather detailed context and facts needed to complete this step only.
+Provide a concise summary of findings that the Executor agent can use.
+"""
+    return llm.invoke(prompt).content
@@ -1,33 +1,81 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import json
+import logging
+from agentflow.llm import get_llm
 from agentflow.graph.state import AgentState
+from agentflow.context import compact_sections, node_budget
+
+logger = logging.getLogger(__name__)
+
+# Nodes the validator may send a rejected draft back to
+REVISION_TARGETS = ("executor", "researcher", "planner")
+
+def parse_review(content: str):
+    """
+    Extracts the structured review from the validator's reply. Falls back to
+    the legacy 'APPROVED' / 'FEEDBACK:' text convention when no JSON is found.
+    """
+    text = content.strip()
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0].strip()
+    try:
+        review = json.loads(text)
+        approved = str(review.get("verdict", "")).upper() == "APPROVED"
+        target = review.get("target") if review.get("target") in REVISION_TARGETS else "executor"
+        issues = [str(i) for i in review.get("issues") or []]
+        summary = review.get("summary") or ""
+    except (ValueError, AttributeError):
+        approved = content.strip().upper().startswith("APPROVED")
+        target = "executor"
+        issues = [] if approved else [content.replace("FEEDBACK:", "").strip()]
+        summary = ""
+    return approved, target, issues, summary
 
 def validator_agent(state: AgentState):
     """
     Validator Agent: Reviews the output and provides feedback or approval.
     """
-    print("--- VALIDATOR ---")
+    logger.debug("--- VALIDATOR ---")
     user_goal = state["user_goal"]
-    draft_output = state["draft_output"]
+    # Oversized drafts are reviewed from an extractive summary that keeps every section heading
+    draft_output = compact_sections(state["draft_output"], node_budget("validator"), user_goal)
     retry_count = state.get("retry_count", 0)
     
-    llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
+    llm = get_llm("validator", temperature=0)
     
     prompt = f"""You are a Validator Agent.
 Objective: {user_goal}
 Draft Output to Review: {draft_output}
 
 Review the output for completeness, accuracy, and quality.
-If the output is excellent and meets the goal, start your response with 'APPROVED'.
-If it needs improvements, provide specific feedback starting with 'FEEDBACK:'.
+Respond with JSON only, in this shape:
+{{"verdict": "APPROVED" or "REVISE",
+ "target": "executor" | "researcher" | "planner",
+ "issues": ["specific, actionable problem", ...],
+ "summary": "one sentence"}}
+Choose the target that must re-run to fix the issues:
+- "executor" for writing problems: structure, clarity, missing sections, tone, errors in the draft itself
+- "researcher" when the draft lacks facts or evidence that were never gathered
+- "planner" only when the overall approach is wrong for the objective
 Max retries allowed is 3. Current retry count: {retry_count}
 """
     
     response = llm.invoke(prompt)
-    feedback = response.content
+    approved, target, issues, summary = parse_review(response.content)
+    
+    # The text form keeps the 'APPROVED' / 'FEEDBACK:' convention the UI and logs rely on
+    if approved:
+        feedback = f"APPROVED{': ' + summary if summary else ''}"
+    else:
+        feedback = "FEEDBACK: " + (summary + "\n" if summary else "") + "\n".join(f"- {i}" for i in issues)
     
     # Logic for conditional transitions will happen in the graph, 
     # but we store the feedback here.
     return {
         "validation_feedback": feedback,
-        "retry_count": retry_count + 1 if "FEEDBACK" in feedback else retry_count
+        "feedback_issues": issues,
+        "approved": approved,
+        "revision_target": None if approved else target,
+        "retry_count": retry_count if approved else retry_count + 1
     }
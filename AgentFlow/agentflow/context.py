@@ -0,0 +1,116 @@
+import math
+import re
+from typing import List, Optional, Tuple
+
+from agentflow.config import env_int
+
+# Default token budgets for the variable-size context each node pastes into its prompt
+DEFAULT_BUDGETS = {
+    "researcher": 3000,
+    "executor": 6000,
+    "validator": 6000,
+}
+
+_TERM = re.compile(r"[a-z0-9]{3,}")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_HEADING = re.compile(r"^#{1,6} ", re.MULTILINE)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Rough token count (about four characters per token); good enough for budgeting without a tokenizer."""
+    return math.ceil(len(text or "") / 4)
+
+
+def node_budget(node: str) -> int:
+    """Context budget in tokens for a node: AGENTFLOW_<NODE>_CONTEXT_TOKENS or the default."""
+    return env_int(f"AGENTFLOW_{node.upper()}_CONTEXT_TOKENS", DEFAULT_BUDGETS.get(node, 4000))
+
+
+def _terms(text: str) -> set:
+    return set(_TERM.findall(text.lower()))
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Splits Markdown into (heading, body) pairs; text before the first heading has an empty heading."""
+    sections = []
+    starts = [m.start() for m in _HEADING.finditer(text)]
+    if not starts or starts[0] > 0:
+        starts.insert(0, 0)
+    for begin, end in zip(starts, starts[1:] + [len(text)]):
+        chunk = text[begin:end].strip()
+        if not chunk:
+            continue
+        if _HEADING.match(chunk):
+            heading, _, body = chunk.partition("\n")
+            sections.append((heading, body.strip()))
+        else:
+            sections.append(("", chunk))
+    return sections
+
+
+def summarize(text: str, budget: int, query: str = "") -> str:
+    """
+    Extractive summary within `budget` tokens: sentences sharing the most
+    terms with `query` are kept first (earlier sentences win ties), then
+    emitted in their original order.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    sentences = [s for s in _SENTENCE.split(text) if s.strip()]
+    wanted = _terms(query)
+    ranked = sorted(range(len(sentences)), key=lambda i: (-len(_terms(sentences[i]) & wanted), i))
+    keep, used = set(), 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i])
+        if used + cost <= budget:
+            keep.add(i)
+            used += cost
+    if not keep and sentences:
+        # Nothing fits whole: keep the start of the best sentence
+        return sentences[ranked[0]][:budget * 4].rstrip() + "..."
+    return " ".join(sentences[i] for i in sorted(keep))
+
+
+def compact_sections(text: str, budget: int, query: str = "") -> str:
+    """Fits Markdown into `budget` by summarising each section to an equal share, keeping every heading."""
+    if estimate_tokens(text) <= budget:
+        return text
+    sections = split_sections(text)
+    share = max(1, _body_budget(sections, budget) // max(1, len(sections)))
+    return "\n\n".join(
+        (f"{heading}\n" if heading else "") + summarize(body, share, query) for heading, body in sections
+    )
+
+
+def _body_budget(sections: List[Tuple[str, str]], budget: int) -> int:
+    """What is left of `budget` for section bodies once every heading is kept."""
+    return max(len(sections), budget - sum(estimate_tokens(heading) for heading, _ in sections))
+
+
+def compact_research(notes: str, plan: List[str], goal: str, budget: int) -> str:
+    """
+    Fits research notes into `budget` tokens for a prompt. Each section is
+    attached to the plan step it overlaps most with, every step gets an equal
+    share of the budget, and sections are summarised towards their step and
+    the goal. Notes already within budget are returned untouched.
+    """
+    if estimate_tokens(notes) <= budget:
+        return notes
+    steps = plan or [goal]
+    sections = split_sections(notes)
+    groups = {i: [] for i in range(len(steps))}
+    step_terms = [_terms(step) for step in steps]
+    for index, (heading, body) in enumerate(sections):
+        terms = _terms(f"{heading} {body}")
+        best = max(range(len(steps)), key=lambda i: len(terms & step_terms[i]))
+        groups[best].append(index)
+
+    # Headings are always kept, so they are paid for before the steps split the rest
+    share = _body_budget(sections, budget) // len(steps)
+    compacted = {}
+    for step_index, members in groups.items():
+        for index in members:
+            heading, body = sections[index]
+            summary = summarize(body, max(1, share // len(members)), f"{steps[step_index]} {goal}")
+            compacted[index] = (f"{heading}\n" if heading else "") + summary
+    return "\n\n".join(compacted[i] for i in sorted(compacted))
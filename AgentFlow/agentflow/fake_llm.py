@@ -0,0 +1,169 @@
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterator, AsyncIterator, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from agentflow.config import env_float, env_int
+
+_FILLER = (
+    "market cost compliance risk customer revenue adoption timeline vendor integration support "
+    "pricing regulation data security team budget forecast pilot metric margin channel"
+).split()
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Latency sampler (seconds) from a spec string:
+      fixed:0.2 | uniform:0.1,0.5 | normal:0.3,0.05 | lognormal:0.3,0.5 (median, sigma)
+    """
+    kind, _, args = (spec or "fixed:0").partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] or [0.0]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        import math
+        mu = math.log(values[0]) if values[0] > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(m.content if isinstance(m.content, str) else json.dumps(m.content) for m in messages)
+
+
+def _field(text: str, label: str) -> str:
+    match = re.search(rf"{label}:\s*(.*)", text)
+    return match.group(1).strip() if match else ""
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for the Gemini chat model, for benchmarks and demos.
+
+    Replies come from `script` (first rule whose "match" substring occurs in
+    the prompt wins) or from built-in responses that satisfy each agent's
+    output format. Every call sleeps for a latency drawn from the configured
+    distribution; `reject_rate` makes the validator send drafts back so the
+    retry loop is exercised. Seeded, so runs are reproducible.
+    """
+
+    script: List[Dict[str, str]] = []
+    latency: str = "fixed:0"
+    reject_rate: float = 0.0
+    words: int = 150
+    seed: int = 0
+
+    _rng: random.Random = PrivateAttr()
+    _sample: Callable[[random.Random], float] = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._sample = parse_latency(self.latency)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "FakeChatModel":
+        """AGENTFLOW_FAKE_LLM_{SCRIPT,LATENCY,REJECT_RATE,WORDS,SEED}."""
+        script = []
+        path = os.getenv("AGENTFLOW_FAKE_LLM_SCRIPT")
+        if path:
+            with open(path) as f:
+                script = json.load(f)
+        return cls(
+            script=script,
+            latency=os.getenv("AGENTFLOW_FAKE_LLM_LATENCY", "fixed:0"),
+            reject_rate=env_float("AGENTFLOW_FAKE_LLM_REJECT_RATE", 0.0),
+            words=env_int("AGENTFLOW_FAKE_LLM_WORDS", 150),
+            seed=env_int("AGENTFLOW_FAKE_LLM_SEED", 0),
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "agentflow-fake"
+
+    def _draw(self):
+        with self._lock:
+            return self._sample(self._rng), self._rng.random(), self._rng.randrange(1 << 30)
+
+    def _prose(self, seed: int, words: int) -> str:
+        rng = random.Random(seed)
+        return " ".join(rng.choice(_FILLER) for _ in range(words)).capitalize() + "."
+
+    def _reply(self, text: str, roll: float, seed: int) -> str:
+        for rule in self.script:
+            if rule.get("match", "") in text:
+                return rule["response"]
+        goal = _field(text, "Objective") or _field(text, "goal") or "the objective"
+        if "Strategic Planner Agent" in text:
+            return json.dumps([f"Assess context for {goal[:60]}", "Analyze costs and benefits",
+                               "Review risks and constraints", "Recommend next steps"])
+        if "Executor Agent revising" in text:
+            return f"<<<<<<< FIND\n\n=======\n## Revisions\n{self._prose(seed, self.words // 3)}\n>>>>>>> REPLACE"
+        if "Validator Agent" in text:
+            if roll < self.reject_rate:
+                return json.dumps({"verdict": "REVISE", "target": "executor",
+                                   "issues": ["Add a section on risks"], "summary": "Missing risk analysis."})
+            return json.dumps({"verdict": "APPROVED", "target": "executor", "issues": [], "summary": "Looks complete."})
+        if "Researcher Agent" in text:
+            return f"Findings: {self._prose(seed, self.words)}"
+        if "Executor Agent" in text:
+            return f"# Report on {goal}\n\n{self._prose(seed, self.words * 2)}"
+        return self._prose(seed, self.words)
+
+    def _usage(self, prompt: str, reply: str) -> Dict[str, int]:
+        # Roughly four characters per token, like the real tokenizers
+        input_tokens, output_tokens = len(prompt) // 4, len(reply) // 4
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+    def _prepare(self, messages):
+        text = _prompt_text(messages)
+        delay, roll, seed = self._draw()
+        reply = self._reply(text, roll, seed)
+        return delay, reply, self._usage(text, reply)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        delay, reply, usage = self._prepare(messages)
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply, usage_metadata=usage))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        delay, reply, usage = self._prepare(messages)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply, usage_metadata=usage))])
+
+    @staticmethod
+    def _chunks(reply: str, usage: Dict[str, int]) -> Iterator[ChatGenerationChunk]:
+        parts = re.findall(r"\S+\s*", reply) or [reply]
+        for i in range(0, len(parts), 8):
+            last = i + 8 >= len(parts)
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="".join(parts[i:i + 8]),
+                usage_metadata=usage if last else None,
+            ))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        # The whole latency is time-to-first-token; the text then arrives at once
+        delay, reply, usage = self._prepare(messages)
+        time.sleep(delay)
+        yield from self._chunks(reply, usage)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        delay, reply, usage = self._prepare(messages)
+        await asyncio.sleep(delay)
+        for chunk in self._chunks(reply, usage):
+            yield chunk
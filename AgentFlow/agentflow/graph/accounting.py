@@ -0,0 +1,33 @@
+import functools
+from typing import Any, Callable, Dict, List
+
+from agentflow.llm import track_calls
+from agentflow.metrics import span
+
+
+def accounted(node: str, fn: Callable) -> Callable:
+    """
+    Wraps a graph node so every LLM call it makes (tokens, latency, cache
+    hit) is appended to the run's `llm_calls`, tagged with the node name.
+    """
+    @functools.wraps(fn)
+    def wrapper(state):
+        with track_calls() as calls, span("node", node):
+            result = fn(state)
+        return {**(result or {}), "llm_calls": [{"node": node, **call} for call in calls]}
+    return wrapper
+
+
+def summarize_calls(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totals of `llm_calls` per node and overall: calls, cache hits, tokens and latency."""
+    empty = {"calls": 0, "cached": 0, "input_tokens": 0, "output_tokens": 0, "latency_ms": 0.0}
+    by_node: Dict[str, Dict[str, Any]] = {}
+    total = dict(empty)
+    for call in calls:
+        for bucket in (by_node.setdefault(call.get("node", ""), dict(empty)), total):
+            bucket["calls"] += 1
+            bucket["cached"] += 1 if call.get("cached") else 0
+            bucket["input_tokens"] += call.get("input_tokens", 0)
+            bucket["output_tokens"] += call.get("output_tokens", 0)
+            bucket["latency_ms"] = round(bucket["latency_ms"] + call.get("latency_ms", 0.0), 1)
+    return {"by_node": by_node, "total": total}
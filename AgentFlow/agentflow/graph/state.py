@@ -1,6 +1,9 @@
 from typing import TypedDict, List, Annotated, Optional
 import operator
 
+# Keys with an append reducer: node updates carry only the new items
+APPEND_KEYS = ("llm_calls",)
+
 class AgentState(TypedDict):
     """
     Shared memory for the AgentFlow multi-agent system.
@@ -10,6 +13,13 @@ class AgentState(TypedDict):
     research_notes: str
     draft_output: str
     validation_feedback: str
+    # Structured review: the node that must re-run and the issues it should fix
+    revision_target: Optional[str]
+    feedback_issues: List[str]
+    # The validator's parsed verdict; routing uses this, never the feedback text
+    approved: bool
     retry_count: int
     current_step: int
+    # One record per LLM call (node, model, tokens, latency); appended to, never replaced
+    llm_calls: Annotated[List[dict], operator.add]
     # history: Annotated[List[dict], operator.add] # Optional: for tracking full trace
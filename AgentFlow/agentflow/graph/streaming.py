@@ -0,0 +1,37 @@
+from typing import Callable
+
+try:
+    from langgraph.config import get_stream_writer
+except ImportError:  # older langgraph without custom stream mode
+    get_stream_writer = None
+
+
+def token_writer(node: str) -> Callable[[str], None]:
+    """
+    Returns a function that emits a generated text chunk on LangGraph's
+    "custom" stream channel as {"node", "token"}. Outside a streaming run
+    (or when the caller did not ask for "custom" events) it does nothing.
+    """
+    writer = None
+    if get_stream_writer is not None:
+        try:
+            writer = get_stream_writer()
+        except Exception:
+            writer = None
+
+    def emit(text: str):
+        if writer is not None and text:
+            writer({"node": node, "token": text})
+
+    return emit
+
+
+def stream_text(llm, prompt, node: str) -> str:
+    """Streams an LLM response through the node's token channel and returns the full text."""
+    emit = token_writer(node)
+    chunks = []
+    for chunk in llm.stream(prompt):
+        if chunk.content:
+            chunks.append(chunk.content)
+            emit(chunk.content)
+    return "".join(chunks)
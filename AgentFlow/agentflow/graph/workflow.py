@@ -1,21 +1,38 @@
+import os
+import hashlib
+import logging
+import threading
 from langgraph.graph import StateGraph, END
 from agentflow.graph.state import AgentState
 from agentflow.agents.planner import planner_agent
 from agentflow.agents.researcher import researcher_agent
 from agentflow.agents.executor import executor_agent
 from agentflow.agents.validator import validator_agent
+from agentflow.checkpoint import get_checkpointer
+from agentflow.graph.accounting import accounted
 
-def define_workflow():
+logger = logging.getLogger(__name__)
+
+def define_workflow(retry_strategy=None, checkpointer=None):
     """
     Defines the multi-agent state machine workflow using LangGraph.
+
+    retry_strategy (default: AGENTFLOW_RETRY_STRATEGY or "incremental"):
+    "incremental" sends a rejected draft back to the node the validator
+    named (usually the executor, which then edits the draft); "full" re-runs
+    planner, researcher and executor from scratch.
+
+    With a checkpointer, state is saved after every node and runs must pass
+    a thread_id in their config (see agentflow.checkpoint.run_config).
     """
+    retry_strategy = retry_strategy or os.getenv("AGENTFLOW_RETRY_STRATEGY", "incremental")
     workflow = StateGraph(AgentState)
 
-    # Add Nodes
-    workflow.add_node("planner", planner_agent)
-    workflow.add_node("researcher", researcher_agent)
-    workflow.add_node("executor", executor_agent)
-    workflow.add_node("validator", validator_agent)
+    # Add Nodes (each records its LLM calls in state["llm_calls"])
+    workflow.add_node("planner", accounted("planner", planner_agent))
+    workflow.add_node("researcher", accounted("researcher", researcher_agent))
+    workflow.add_node("executor", accounted("executor", executor_agent))
+    workflow.add_node("validator", accounted("validator", validator_agent))
 
     # Set Entry Point
     workflow.set_entry_point("planner")
@@ -27,30 +44,72 @@ def define_workflow():
 
     # Define Conditional Edges (Validator -> ???)
     def should_continue(state: AgentState):
-        feedback = state.get("validation_feedback", "")
+        approved = state.get("approved")
+        if approved is None:
+            # Checkpoints written before the verdict was stored in state
+            approved = state.get("validation_feedback", "").startswith("APPROVED")
         retry_count = state.get("retry_count", 0)
         
-        if "APPROVED" in feedback:
+        if approved:
             return "end"
         elif retry_count >= 3:
-            print(f"Max retries reached ({retry_count}). Stopping.")
+            logger.warning("Max retries reached (%d). Stopping.", retry_count)
             return "end"
+        elif retry_strategy == "full":
+            return "planner"
         else:
-            # If feedback contains specific instructions, we could route 
-            # back to Planner or Executor. Here we'll route back to Planner 
-            # to adjust the strategy if needed.
-            return "retry"
+            # Re-run only the node the validator blamed; earlier outputs are reused
+            return state.get("revision_target") or "executor"
 
     workflow.add_conditional_edges(
         "validator",
         should_continue,
         {
             "end": END,
-            "retry": "planner"
+            "planner": "planner",
+            "researcher": "researcher",
+            "executor": "executor"
         }
     )
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+_compiled = None
+_mermaid = None
+_lock = threading.Lock()
+
+def get_workflow():
+    """
+    Returns the process-wide compiled workflow, compiling it on first use.
+    The compiled graph holds no per-run state (checkpoints are keyed by
+    thread_id), so concurrent runs can share it.
+    """
+    global _compiled
+    if _compiled is None:
+        with _lock:
+            if _compiled is None:
+                _compiled = define_workflow(checkpointer=get_checkpointer())
+    return _compiled
+
+def get_workflow_mermaid():
+    """Returns (mermaid_source, etag) for the cached workflow, rendered once."""
+    global _mermaid
+    if _mermaid is None:
+        workflow = get_workflow()
+        with _lock:
+            if _mermaid is None:
+                source = workflow.get_graph().draw_mermaid()
+                _mermaid = (source, f'"{hashlib.sha256(source.encode()).hexdigest()[:16]}"')
+    return _mermaid
+
+def reload_workflow():
+    """Rebuilds the compiled workflow and its diagram, e.g. after agent code changes."""
+    global _compiled, _mermaid
+    compiled = define_workflow(checkpointer=get_checkpointer())
+    with _lock:
+        _compiled = compiled
+        _mermaid = None
+    return get_workflow_mermaid()
 
 # Example usage/export
-# app = define_workflow()
+# app = get_workflow()
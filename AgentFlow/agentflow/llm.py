@@ -0,0 +1,279 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_google_genai import ChatGoogleGenerativeAI
+from agentflow.config import env_int, env_float
+from agentflow.llm_cache import LLMCache, cache_key
+from agentflow.context import estimate_tokens
+from agentflow.metrics import LLM_TOKENS, span, timed_stream
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+USAGE_KEYS = ("calls", "input_tokens", "output_tokens", "cache_hits")
+
+_call_log: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("agentflow_llm_call_log", default=None)
+
+
+@contextmanager
+def track_calls():
+    """
+    Collects one record per LLM call made inside the block (model, tokens,
+    estimated prompt tokens, latency, cache hit). Worker threads started with
+    a copy of the context append to the same list.
+    """
+    calls: List[Dict[str, Any]] = []
+    token = _call_log.set(calls)
+    try:
+        yield calls
+    finally:
+        _call_log.reset(token)
+
+
+def resolve_model(role: Optional[str] = None) -> str:
+    """
+    Model for an agent role: AGENTFLOW_<ROLE>_MODEL, then AGENTFLOW_MODEL,
+    then the built-in default.
+    """
+    if role:
+        override = os.getenv(f"AGENTFLOW_{role.upper()}_MODEL")
+        if override:
+            return override
+    return os.getenv("AGENTFLOW_MODEL", DEFAULT_MODEL)
+
+
+def create_chat_model(model: str, temperature: float, **options):
+    """
+    The LangChain chat model behind every client. AGENTFLOW_LLM_PROVIDER
+    selects "google" (Gemini, default) or "fake", the offline stand-in in
+    agentflow.fake_llm used for benchmarks and demos without an API key.
+    """
+    provider = os.getenv("AGENTFLOW_LLM_PROVIDER", "google")
+    if provider == "fake":
+        from agentflow.fake_llm import FakeChatModel
+        return FakeChatModel.from_env()
+    if provider != "google":
+        raise ValueError(f"Unknown AGENTFLOW_LLM_PROVIDER: {provider}")
+    # Retries are handled by LLMClient so they respect the concurrency cap
+    return ChatGoogleGenerativeAI(model=model, temperature=temperature, max_retries=0, **options)
+
+
+def is_rate_limit_error(exc: Exception) -> bool:
+    text = f"{type(exc).__name__} {exc}".lower()
+    return any(marker in text for marker in ("resourceexhausted", "429", "rate limit", "quota", "too many requests"))
+
+
+class LLMClient:
+    """
+    Shared chat-model handle for one (model, temperature, options) combination.
+
+    Every agent using the same settings shares the underlying client (and its
+    HTTP connections). Calls are capped per model by a semaphore and retried
+    with jittered exponential backoff when the provider reports rate limiting.
+    With a `cache`, identical calls are answered from disk without touching
+    the provider (or the semaphore).
+    """
+
+    def __init__(self, model: str, temperature: float, semaphore: threading.BoundedSemaphore,
+                 max_retries: int = 4, backoff: float = 1.0, max_backoff: float = 30.0,
+                 cache: Optional[LLMCache] = None, **options):
+        self.model = model
+        self.temperature = temperature
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._semaphore = semaphore
+        self.cache = cache
+        self._options = options
+        self._usage_lock = threading.Lock()
+        self.usage = dict.fromkeys(USAGE_KEYS, 0)
+        self.llm = create_chat_model(model, temperature, **options)
+        self.provider = getattr(self.llm, "_llm_type", type(self.llm).__name__)
+
+    def _cache_lookup(self, prompt: Any, kwargs: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        if self.cache is None:
+            return None, None
+        key = cache_key(self.provider, self.model, self.temperature, {**self._options, **kwargs}, prompt)
+        hit = self.cache.get(key)
+        if hit is not None:
+            with self._usage_lock:
+                self.usage["cache_hits"] += 1
+        return key, hit
+
+    def _record_call(self, prompt: Any, began: float, usage: Optional[Dict[str, Any]], cached: bool = False):
+        log = _call_log.get()
+        if log is None:
+            return
+        usage = usage or {}
+        log.append({
+            "model": self.model,
+            "prompt_tokens_estimate": estimate_tokens(prompt if isinstance(prompt, str) else str(prompt)),
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "latency_ms": round((time.perf_counter() - began) * 1000, 1),
+            "cached": cached,
+        })
+
+    def invoke(self, prompt: Any, **kwargs):
+        began = time.perf_counter()
+        key, hit = self._cache_lookup(prompt, kwargs)
+        if hit is not None:
+            self._record_call(prompt, began, hit["usage"], cached=True)
+            return AIMessage(content=hit["content"], response_metadata={"cached": True})
+        attempt = 0
+        while True:
+            with self._semaphore:
+                try:
+                    with span("llm", self.model):
+                        response = self.llm.invoke(prompt, **kwargs)
+                        usage = getattr(response, "usage_metadata", None)
+                        self._account(usage)
+                        self._record_call(prompt, began, usage)
+                        if key is not None:
+                            self.cache.put(key, self.model, response.content, usage)
+                        return response
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                        raise
+            self._backoff_sleep(attempt)
+            attempt += 1
+
+    def stream(self, prompt: Any, **kwargs) -> Iterator[Any]:
+        """
+        Yields message chunks as the model generates them; only retried before
+        the first chunk. A cached response arrives as a single chunk.
+        """
+        began = time.perf_counter()
+        key, hit = self._cache_lookup(prompt, kwargs)
+        if hit is not None:
+            self._record_call(prompt, began, hit["usage"], cached=True)
+            yield AIMessageChunk(content=hit["content"], response_metadata={"cached": True})
+            return
+        attempt = 0
+        while True:
+            started = False
+            usage = {}
+            parts = []
+            with self._semaphore:
+                try:
+                    # Times the provider only, not the consumer's work between chunks
+                    for chunk in timed_stream("llm", self.model, self.llm.stream(prompt, **kwargs)):
+                        started = True
+                        for k, v in (getattr(chunk, "usage_metadata", None) or {}).items():
+                            if isinstance(v, int):
+                                usage[k] = usage.get(k, 0) + v
+                        if isinstance(chunk.content, str):
+                            parts.append(chunk.content)
+                        yield chunk
+                    self._account(usage)
+                    self._record_call(prompt, began, usage)
+                    if key is not None:
+                        self.cache.put(key, self.model, "".join(parts), usage)
+                    return
+                except Exception as e:
+                    if started or not is_rate_limit_error(e) or attempt >= self.max_retries:
+                        raise
+            self._backoff_sleep(attempt)
+            attempt += 1
+
+    def _account(self, usage: Optional[Dict[str, Any]]):
+        usage = usage or {}
+        LLM_TOKENS.labels(self.model, "input").inc(usage.get("input_tokens", 0))
+        LLM_TOKENS.labels(self.model, "output").inc(usage.get("output_tokens", 0))
+        with self._usage_lock:
+            self.usage["calls"] += 1
+            self.usage["input_tokens"] += usage.get("input_tokens", 0)
+            self.usage["output_tokens"] += usage.get("output_tokens", 0)
+
+    def _backoff_sleep(self, attempt: int):
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        # Sleep outside the semaphore so other calls can use the slot
+        time.sleep(delay * (0.5 + random.random() / 2))
+
+
+class LLMRegistry:
+    """Process-wide cache of LLMClients keyed by model, temperature and options."""
+
+    def __init__(self):
+        self._clients: Dict[Tuple, LLMClient] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._response_cache = None
+        self._lock = threading.Lock()
+        # Separate from _lock: get() opens the cache while holding _lock
+        self._cache_lock = threading.Lock()
+
+    def response_cache(self) -> Optional[LLMCache]:
+        """The shared on-disk response cache, or None when AGENTFLOW_LLM_CACHE is off."""
+        with self._cache_lock:
+            if self._response_cache is None:
+                self._response_cache = LLMCache.from_env() or False
+            return self._response_cache or None
+
+    def _semaphore_for(self, model: str) -> threading.BoundedSemaphore:
+        if model not in self._semaphores:
+            limit = env_int("AGENTFLOW_LLM_MAX_CONCURRENCY", 4)
+            self._semaphores[model] = threading.BoundedSemaphore(max(1, limit))
+        return self._semaphores[model]
+
+    def get(self, role: Optional[str] = None, temperature: float = 0, model: Optional[str] = None,
+            cache: Optional[bool] = None, **options) -> LLMClient:
+        """
+        `cache` defaults to on for temperature 0 (deterministic calls) and off
+        otherwise; pass cache=True to opt a sampling client in.
+        """
+        model = model or resolve_model(role)
+        use_cache = cache if cache is not None else float(temperature) == 0
+        key = (model, float(temperature), use_cache, tuple(sorted(options.items())))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = LLMClient(
+                    model,
+                    temperature,
+                    self._semaphore_for(model),
+                    max_retries=env_int("AGENTFLOW_LLM_MAX_RETRIES", 4),
+                    backoff=env_float("AGENTFLOW_LLM_BACKOFF", 1.0),
+                    cache=self.response_cache() if use_cache else None,
+                    **options,
+                )
+                self._clients[key] = client
+            return client
+
+    def usage(self) -> Dict[str, int]:
+        """LLM calls and tokens summed over every client since the last reset."""
+        total = dict.fromkeys(USAGE_KEYS, 0)
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            with client._usage_lock:
+                for k in total:
+                    total[k] += client.usage[k]
+        return total
+
+    def reset_usage(self):
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            with client._usage_lock:
+                client.usage = dict.fromkeys(USAGE_KEYS, 0)
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+            self._semaphores.clear()
+        with self._cache_lock:
+            # Re-read AGENTFLOW_LLM_CACHE* on next use
+            self._response_cache = None
+
+
+registry = LLMRegistry()
+
+
+def get_llm(role: Optional[str] = None, temperature: float = 0, **options) -> LLMClient:
+    """Returns the shared client for an agent role at the given temperature."""
+    return registry.get(role=role, temperature=temperature, **options)
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from agentflow.config import env_bool, env_float
+
+DEFAULT_CACHE_PATH = "agentflow_llm_cache.sqlite"
+
+# Writes between re-reads of the table's total size (other processes write to the same file)
+SIZE_RESYNC_WRITES = 64
+
+_bypass: ContextVar[bool] = ContextVar("agentflow_llm_cache_bypass", default=False)
+
+
+@contextmanager
+def cache_bypass(enabled: bool = True):
+    """
+    Skips the LLM cache (no reads, no writes) for calls made inside the block.
+    Context variables follow LangGraph nodes onto their worker threads, so
+    wrapping a workflow run bypasses the cache for that run only.
+    """
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def is_bypassed() -> bool:
+    return _bypass.get()
+
+
+def _prompt_text(prompt: Any) -> str:
+    if isinstance(prompt, str):
+        return prompt
+    # Message lists: role + content is what the model sees
+    return json.dumps(
+        [(getattr(m, "type", type(m).__name__), getattr(m, "content", m)) for m in prompt],
+        default=str,
+    )
+
+
+def cache_key(provider: str, model: str, temperature: float, options: Dict[str, Any], prompt: Any) -> str:
+    """
+    Content address of one call: hash of provider, model, temperature, client
+    options and prompt. The provider keeps e.g. canned fake-model replies from
+    ever being served to a real client of the same model name.
+    """
+    payload = json.dumps(
+        {"provider": provider, "model": model, "temperature": float(temperature), "options": options,
+         "prompt": _prompt_text(prompt)},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    Disk-backed, content-addressed store of LLM responses (SQLite).
+
+    Entries are evicted least-recently-used once their total size exceeds
+    `max_bytes`. Safe to share between threads and between processes using
+    the same file. The size is tracked locally and re-read from the table
+    every SIZE_RESYNC_WRITES writes and before evicting, so with several
+    processes the cap can be overshot by at most that many writes each.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                content TEXT,
+                usage TEXT,
+                size INTEGER,
+                created_at REAL,
+                accessed_at REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)")
+        self._size = self._table_size()
+        self._writes_since_sync = 0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "bypassed": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMCache"]:
+        """AGENTFLOW_LLM_CACHE (default on), AGENTFLOW_LLM_CACHE_PATH, AGENTFLOW_LLM_CACHE_MAX_MB."""
+        if not env_bool("AGENTFLOW_LLM_CACHE", True):
+            return None
+        return cls(
+            path=os.getenv("AGENTFLOW_LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+            max_bytes=int(env_float("AGENTFLOW_LLM_CACHE_MAX_MB", 256) * 1024 * 1024),
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if is_bypassed():
+            with self._lock:
+                self.stats["bypassed"] += 1
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT content, usage FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.stats["hits"] += 1
+        return {"content": row[0], "usage": json.loads(row[1] or "{}")}
+
+    def put(self, key: str, model: str, content: str, usage: Optional[Dict[str, Any]] = None):
+        if is_bypassed() or not isinstance(content, str):
+            return
+        usage_json = json.dumps(usage or {}, default=str)
+        size = len(content.encode()) + len(usage_json)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, content, usage, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, content, usage_json, size, now, now),
+            )
+            self._size += size - (old[0] if old else 0)
+            self.stats["writes"] += 1
+            self._writes_since_sync += 1
+            if self._writes_since_sync >= SIZE_RESYNC_WRITES:
+                self._size = self._table_size()
+                self._writes_since_sync = 0
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _table_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def _evict(self):
+        # Write-locks the file so two processes don't both trim from the same stale total
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._size = self._table_size()
+            self._writes_since_sync = 0
+            # Trim to 90% of the cap so a full cache doesn't evict on every write
+            target = self.max_bytes * 0.9
+            doomed = []
+            if self._size > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at").fetchall()
+                for key, size in rows:
+                    if self._size <= target:
+                        break
+                    doomed.append((key,))
+                    self._size -= size
+                self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self.stats["evictions"] += len(doomed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": entries,
+                "bytes": self._table_size(),
+                "max_bytes": self.max_bytes,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._size = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,29 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener = None
+
+
+def setup_logging(level=None):
+    """
+    Leveled logging (LOG_LEVEL, default INFO) through an in-memory queue that
+    a background thread drains to stdout, so agents and request handlers
+    never block on console writes.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    records = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(FORMAT))
+    _listener = logging.handlers.QueueListener(records, handler)
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(records)]
+    root.setLevel(str(level or os.getenv("LOG_LEVEL", "INFO")).upper())
+    _listener.start()
+    atexit.register(_listener.stop)
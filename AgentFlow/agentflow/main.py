@@ -1,14 +1,27 @@
 import os
-from fastapi import FastAPI, BackgroundTasks
+import json
+import asyncio
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 from dotenv import load_dotenv
-from agentflow.graph.workflow import define_workflow
+from agentflow.graph.workflow import get_workflow, get_workflow_mermaid, reload_workflow
+from agentflow.runs import Run, RunActive, RunManager, RunRejected
+from agentflow.checkpoint import run_config, load_checkpoint, replay_events
+from agentflow.llm import registry
+from agentflow.llm_cache import cache_bypass
+from agentflow.graph.accounting import summarize_calls
+from agentflow.log import setup_logging
+from agentflow import metrics
 
 load_dotenv()
+setup_logging()
 
 app = FastAPI(title="AgentFlow Multi-Agent System")
+metrics.install(app)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -18,62 +31,252 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global store for demo purposes (In-memory)
-execution_logs = []
-current_agent_state = {}
+# Each /run gets its own log/state buffers; runs execute on a bounded worker pool
+run_manager = RunManager.from_env()
 
 class TaskRequest(BaseModel):
     goal: str
+    # False: every LLM call in this run goes to the provider, even if cached
+    use_cache: bool = True
+
+@app.on_event("startup")
+async def startup_event():
+    # Compile the graph and render its diagram once, before the first request
+    get_workflow_mermaid()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    run_manager.shutdown()
 
 @app.get("/")
 async def root():
     return {"message": "AgentFlow API is active"}
 
 @app.get("/graph")
-async def get_graph():
+async def get_graph(request: Request, response: Response):
     """Returns the Mermaid graph for visualization"""
-    workflow = define_workflow()
-    return {"mermaid": workflow.get_graph().draw_mermaid()}
+    mermaid, etag = get_workflow_mermaid()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return {"mermaid": mermaid}
+
+@app.post("/graph/reload")
+async def reload_graph():
+    """Recompiles the workflow; runs already in progress keep the graph they started with"""
+    _, etag = reload_workflow()
+    return {"status": "reloaded", "etag": etag}
+
+def _log_entry(node, values):
+    return {
+        "node": node,
+        "updates": {k: str(v)[:200] + "..." if isinstance(v, str) and len(str(v)) > 200 else v for k, v in values.items()}
+    }
+
+def execute_workflow(run, workflow, resume=False, use_cache=True):
+    """
+    Streams the workflow for a run, checkpointing under its run ID. With
+    resume=True the run continues from its last completed node: earlier node
+    events are replayed from the checkpoints and no finished node runs again.
+    """
+    with cache_bypass(not use_cache):
+        _stream_workflow(run, workflow, resume, use_cache)
+
+def _stream_workflow(run, workflow, resume, use_cache):
+    config = run_config(run.run_id, run.goal, use_cache=use_cache)
+    if resume:
+        for event in replay_events(workflow, run.run_id):
+            run.record(_log_entry(event["node"], event["values"]), event["values"])
+        # None input tells LangGraph to continue from the saved checkpoint
+        for mode, event in workflow.stream(None, config, stream_mode=["updates", "custom"]):
+            _record_event(run, mode, event)
+        return
 
-@app.post("/run")
-async def run_task(request: TaskRequest, background_tasks: BackgroundTasks):
-    """Triggers the multi-agent flow"""
-    global execution_logs, current_agent_state
-    execution_logs = []
-    
-    workflow = define_workflow()
-    
     initial_state = {
-        "user_goal": request.goal,
+        "user_goal": run.goal,
         "plan": [],
         "research_notes": "",
         "draft_output": "",
         "validation_feedback": "",
+        "revision_target": None,
+        "feedback_issues": [],
+        "approved": False,
         "retry_count": 0,
-        "current_step": 0
+        "current_step": 0,
+        "llm_calls": []
+    }
+    # "updates": one event per finished node; "custom": token chunks emitted by streaming agents
+    for mode, event in workflow.stream(initial_state, config, stream_mode=["updates", "custom"]):
+        _record_event(run, mode, event)
+
+def _record_event(run, mode, event):
+    if mode == "custom":
+        run.record_token(event.get("node", ""), event.get("token", ""))
+        return
+    for node, values in event.items():
+        run.record(_log_entry(node, values), values)
+
+@app.post("/run")
+async def run_task(request: TaskRequest):
+    """Triggers the multi-agent flow"""
+    workflow = get_workflow()
+    try:
+        run = run_manager.submit(request.goal, lambda r: execute_workflow(r, workflow, use_cache=request.use_cache))
+    except RunRejected as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"status": "started", "goal": request.goal, "run_id": run.run_id}
+
+def _restore_run(run_id: str):
+    """Rebuilds a run that is no longer in memory (restart, eviction) from its checkpoints."""
+    workflow = get_workflow()
+    snapshot = load_checkpoint(workflow, run_id)
+    if snapshot is None:
+        return None
+    run = Run(snapshot.values.get("user_goal", ""), run_id=run_id)
+    for event in replay_events(workflow, run_id):
+        run.record(_log_entry(event["node"], event["values"]), event["values"])
+    run.set_status("interrupted" if snapshot.next else "completed")
+    return run_manager.restore(run)
+
+async def _get_run(run_id: str):
+    run = run_manager.get(run_id)
+    if run is None:
+        run = await run_in_threadpool(_restore_run, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found or expired")
+    return run
+
+@app.get("/llm/cache/stats")
+async def llm_cache_stats():
+    """Hit rate and size of the on-disk LLM response cache"""
+    cache = registry.response_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **(await run_in_threadpool(cache.get_stats))}
+
+@app.get("/runs")
+async def list_runs():
+    return {"runs": run_manager.list()}
+
+@app.get("/runs/{run_id}")
+async def get_run(run_id: str):
+    return (await _get_run(run_id)).summary()
+
+@app.get("/runs/{run_id}/logs")
+async def get_run_logs(run_id: str, since: int = 0):
+    """Log entries with seq >= since; pass back `next` to resume without re-downloading"""
+    logs = (await _get_run(run_id)).get_logs(since)
+    return {"logs": logs, "next": since + len(logs)}
+
+def _sse(event: str, data, event_id=None):
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.get("/runs/{run_id}/events")
+async def stream_run_events(run_id: str, request: Request, since: int = 0):
+    """
+    Server-Sent Events: one 'node' event per LangGraph node update (with the
+    full, untruncated values) as it happens, 'token' events while the
+    researcher/executor are generating, then 'end' with the run summary.
+    Reconnects resume after the Last-Event-ID header (or ?since=); tokens are
+    live-only and are superseded by the node event carrying the full text.
+    """
+    run = await _get_run(run_id)
+    last_event_id = request.headers.get("last-event-id")
+    start = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else since
+
+    async def events():
+        cursor = start
+        # Only tokens produced after connecting; earlier text arrives with its node event
+        token_cursor = run.token_cursor()
+        waiter = run.subscribe()
+        try:
+            while True:
+                waiter.clear()
+                # Read status before entries so nothing recorded just before finishing is missed
+                finished = run.finished
+                items, token_cursor = run.updates_since(cursor, token_cursor)
+                for kind, a, b in items:
+                    if kind == "token":
+                        yield _sse("token", {"node": a, "text": b})
+                    else:
+                        yield _sse("node", {"seq": a["seq"], "node": a["node"], "values": b}, a["seq"])
+                        cursor = a["seq"] + 1
+                if finished:
+                    yield _sse("end", run.summary())
+                    return
+                if await request.is_disconnected():
+                    return
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            run.unsubscribe(waiter)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/runs/{run_id}/state")
+async def get_run_state(run_id: str):
+    return (await _get_run(run_id)).get_state()
+
+@app.get("/runs/{run_id}/usage")
+async def get_run_usage(run_id: str):
+    """Per-node LLM calls, tokens and latency for a run, plus the raw call records"""
+    calls = (await _get_run(run_id)).get_state().get("llm_calls") or []
+    return {**summarize_calls(calls), "calls": calls}
+
+@app.post("/runs/{run_id}/resume")
+async def resume_run(run_id: str):
+    """Continues an interrupted or failed run from its last checkpointed node"""
+    workflow = get_workflow()
+    snapshot = await run_in_threadpool(load_checkpoint, workflow, run_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No checkpoint for this run")
+    if not snapshot.next:
+        raise HTTPException(status_code=409, detail="Run already completed; use /runs/{run_id}/replay")
+    goal = snapshot.values.get("user_goal", "")
+    # Keep the original run's cache setting (checkpoints from before it was recorded default to on)
+    use_cache = (snapshot.metadata or {}).get("use_cache", True)
+    try:
+        run = run_manager.submit(goal, lambda r: execute_workflow(r, workflow, resume=True, use_cache=use_cache),
+                                 run_id=run_id)
+    except RunActive as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except RunRejected as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"status": "resumed", "goal": goal, "run_id": run.run_id, "next": list(snapshot.next)}
+
+@app.get("/runs/{run_id}/replay")
+async def replay_run(run_id: str):
+    """A run's node events and final state, read from its checkpoints (no LLM calls)"""
+    workflow = get_workflow()
+    snapshot = await run_in_threadpool(load_checkpoint, workflow, run_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No checkpoint for this run")
+    events = await run_in_threadpool(replay_events, workflow, run_id)
+    return {
+        "run_id": run_id,
+        "events": [{"seq": i, **e} for i, e in enumerate(events)],
+        "state": snapshot.values,
+        "next": list(snapshot.next),
     }
-    
-    def execute_workflow():
-        global current_agent_state
-        for event in workflow.stream(initial_state):
-            for node, values in event.items():
-                log_entry = {
-                    "node": node,
-                    "updates": {k: str(v)[:200] + "..." if isinstance(v, str) and len(str(v)) > 200 else v for k, v in values.items()}
-                }
-                execution_logs.append(log_entry)
-                current_agent_state.update(values)
-
-    background_tasks.add_task(execute_workflow)
-    return {"status": "started", "goal": request.goal}
 
+# Legacy endpoints: the most recently started run
 @app.get("/logs")
-async def get_logs():
-    return {"logs": execution_logs}
+async def get_logs(since: int = 0):
+    run = run_manager.latest()
+    logs = run.get_logs(since) if run else []
+    return {"logs": logs, "next": since + len(logs)}
 
 @app.get("/state")
 async def get_state():
-    return current_agent_state
+    run = run_manager.latest()
+    return run.get_state() if run else {}
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, TypeVar
+
+from fastapi import Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+# From fast cache hits to multi-minute runs
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+SPAN_SECONDS = Histogram(
+    "agentflow_span_seconds",
+    "Duration of instrumented operations (LLM calls, graph nodes, research tools)",
+    ["kind", "name", "status"],
+    buckets=BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "agentflow_llm_tokens_total",
+    "Tokens reported by the LLM provider",
+    ["model", "direction"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "agentflow_http_request_seconds",
+    "HTTP request duration by route",
+    ["method", "route", "status"],
+    buckets=BUCKETS,
+)
+
+T = TypeVar("T")
+
+
+@contextmanager
+def span(kind: str, name: str):
+    """Times the block into agentflow_span_seconds{kind, name, status}."""
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except (GeneratorExit, asyncio.CancelledError):
+        # The caller went away (e.g. a client disconnect); not a failure of the operation
+        status = "cancelled"
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        SPAN_SECONDS.labels(kind, name, status).observe(time.perf_counter() - start)
+
+
+def timed_stream(kind: str, name: str, chunks: Iterable[T]) -> Iterator[T]:
+    """
+    Passes `chunks` through, timing only the waits for the next chunk: time
+    the consumer spends between chunks is not counted. Recorded once, when
+    the stream ends, fails ("error") or is abandoned by the consumer
+    ("cancelled").
+    """
+    it = iter(chunks)
+    elapsed = 0.0
+    status = "ok"
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(it)
+            except StopIteration:
+                break
+            except BaseException:
+                status = "error"
+                raise
+            finally:
+                elapsed += time.perf_counter() - start
+            yield chunk
+    except GeneratorExit:
+        status = "cancelled"
+        raise
+    finally:
+        SPAN_SECONDS.labels(kind, name, status).observe(elapsed)
+
+
+def install(app):
+    """Adds per-route request timing and a Prometheus-format GET /metrics to the FastAPI app."""
+
+    @app.middleware("http")
+    async def time_requests(request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # Route template, not the raw path (run IDs), keeps label cardinality bounded
+            route = request.scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                request.method, getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - start)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
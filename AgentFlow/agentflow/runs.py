@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from agentflow.config import env_int, env_float
+from agentflow.graph.state import APPEND_KEYS
+
+logger = logging.getLogger(__name__)
+
+
+# Live token chunks kept per run for subscribers that fall slightly behind
+TOKEN_BUFFER_SIZE = 1024
+
+
+class RunRejected(Exception):
+    """Raised when the run queue is full and a new run cannot be admitted."""
+
+
+class RunActive(RunRejected):
+    """Raised when a run id is submitted again while that run is still queued or running."""
+
+
+class Run:
+    """
+    One execution of the workflow: its own log and state buffers, guarded by
+    a lock because the worker thread writes while API handlers read.
+
+    Every log entry carries a sequence number (its index) so readers can
+    resume from a cursor, and async subscribers are woken as entries arrive.
+    Streamed LLM tokens are live-only: they sit in a short ring buffer for
+    subscribers and never enter the log, which keeps just the final values.
+    """
+
+    def __init__(self, goal: str, run_id: Optional[str] = None):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.goal = goal
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.logs: List[Dict[str, Any]] = []
+        # Full (untruncated) node updates, parallel to self.logs, for push subscribers
+        self._values: List[Dict[str, Any]] = []
+        self._subscribers = set()
+        self._tokens = deque(maxlen=TOKEN_BUFFER_SIZE)
+        self._token_seq = 0
+        self.state: Dict[str, Any] = {}
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, log_entry: Dict[str, Any], values: Dict[str, Any]):
+        with self._lock:
+            self.logs.append({"seq": len(self.logs), "ts": time.time(), **log_entry})
+            self._values.append(values)
+            for k, v in values.items():
+                # Mirror LangGraph's reducers so state matches the graph's own view
+                if k in APPEND_KEYS and isinstance(v, list):
+                    self.state[k] = self.state.get(k, []) + v
+                else:
+                    self.state[k] = v
+        self._notify()
+
+    def record_token(self, node: str, text: str):
+        with self._lock:
+            # Remember how many log entries preceded the chunk so readers can interleave in order
+            self._tokens.append((self._token_seq, len(self.logs), node, text))
+            self._token_seq += 1
+        self._notify()
+
+    def token_cursor(self) -> int:
+        with self._lock:
+            return self._token_seq
+
+    def updates_since(self, cursor: int, token_cursor: int):
+        """
+        Returns (items, next_token_cursor) where items are ("node", entry, values)
+        and ("token", node, text) tuples in the order they were recorded. Token
+        chunks already dropped from the ring buffer are skipped.
+        """
+        with self._lock:
+            tokens = [t for t in self._tokens if t[0] >= token_cursor]
+            items = []
+            ti = 0
+            for entry, values in zip(self.logs[cursor:], self._values[cursor:]):
+                while ti < len(tokens) and tokens[ti][1] <= entry["seq"]:
+                    items.append(("token", tokens[ti][2], tokens[ti][3]))
+                    ti += 1
+                items.append(("node", entry, values))
+            items.extend(("token", t[2], t[3]) for t in tokens[ti:])
+            return items, self._token_seq
+
+    def set_status(self, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.status = status
+            if status == "running":
+                self.started_at = time.time()
+            elif status in ("completed", "failed", "interrupted"):
+                self.finished_at = time.time()
+                self.error = error
+        self._notify()
+
+    def subscribe(self) -> asyncio.Event:
+        """Returns an event (bound to the caller's loop) that is set whenever the run changes."""
+        event = asyncio.Event()
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), event))
+        return event
+
+    def unsubscribe(self, event: asyncio.Event):
+        with self._lock:
+            self._subscribers = {(loop, ev) for loop, ev in self._subscribers if ev is not event}
+
+    def _notify(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, event in subscribers:
+            # Called from the worker thread; hand the wake-up to the subscriber's loop
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+    @property
+    def finished(self) -> bool:
+        # "interrupted": restored from a checkpoint that stopped mid-run; it can be resumed
+        return self.status in ("completed", "failed", "interrupted")
+
+    def get_logs(self, since: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self.logs[since:]
+
+    def get_state(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.state)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "goal": self.goal,
+                "status": self.status,
+                "error": self.error,
+                "events": len(self.logs),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class RunManager:
+    """
+    Executes workflow runs on a bounded worker pool.
+
+    At most `max_concurrent` runs execute at once and up to `max_queued` more
+    wait for a worker; anything beyond that is rejected. Finished runs are
+    kept for `ttl` seconds (and at most `max_retained`) so their logs and
+    state can still be fetched, then evicted.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queued: int = 8, ttl: float = 3600.0, max_retained: int = 100):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.max_retained = max_retained
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="agentflow-run")
+        self._runs: Dict[str, Run] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RunManager":
+        return cls(
+            max_concurrent=env_int("AGENTFLOW_MAX_CONCURRENT_RUNS", 2),
+            max_queued=env_int("AGENTFLOW_MAX_QUEUED_RUNS", 8),
+            ttl=env_float("AGENTFLOW_RUN_TTL", 3600.0),
+            max_retained=env_int("AGENTFLOW_MAX_RETAINED_RUNS", 100),
+        )
+
+    def _evict(self):
+        now = time.time()
+        expired = [rid for rid, run in self._runs.items() if run.finished and now - run.finished_at > self.ttl]
+        for rid in expired:
+            del self._runs[rid]
+        finished = sorted((r for r in self._runs.values() if r.finished), key=lambda r: r.finished_at)
+        for run in finished[:max(0, len(self._runs) - self.max_retained)]:
+            del self._runs[run.run_id]
+        self._futures = {rid: f for rid, f in self._futures.items() if rid in self._runs and not f.done()}
+
+    def submit(self, goal: str, execute: Callable[[Run], None], run_id: Optional[str] = None) -> Run:
+        """
+        Admits a run and schedules `execute(run)` on the worker pool. Passing
+        the `run_id` of an earlier run (e.g. to resume it) replaces that entry.
+        """
+        with self._lock:
+            self._evict()
+            existing = self._runs.get(run_id) if run_id else None
+            if existing is not None and not existing.finished:
+                raise RunActive(f"Run {run_id} is already {existing.status}")
+            active = sum(1 for r in self._runs.values() if not r.finished)
+            if active >= self.max_concurrent + self.max_queued:
+                raise RunRejected(f"{active} runs already active or queued (limit {self.max_concurrent + self.max_queued})")
+            run = Run(goal, run_id=run_id)
+            self._runs[run.run_id] = run
+
+        def worker():
+            run.set_status("running")
+            try:
+                execute(run)
+                run.set_status("completed")
+            except Exception as e:
+                logger.error("Run %s failed: %s", run.run_id, e)
+                run.set_status("failed", str(e))
+
+        future = self._executor.submit(worker)
+        with self._lock:
+            self._futures[run.run_id] = future
+        return run
+
+    def restore(self, run: Run) -> Run:
+        """Registers a run rebuilt from its checkpoints; an entry already in memory wins."""
+        with self._lock:
+            return self._runs.setdefault(run.run_id, run)
+
+    def get(self, run_id: str) -> Optional[Run]:
+        with self._lock:
+            self._evict()
+            return self._runs.get(run_id)
+
+    def latest(self) -> Optional[Run]:
+        with self._lock:
+            if not self._runs:
+                return None
+            return max(self._runs.values(), key=lambda r: r.created_at)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._evict()
+            return [r.summary() for r in sorted(self._runs.values(), key=lambda r: r.created_at, reverse=True)]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        # Runs still waiting for a worker never start; finish them so /runs and SSE streams end
+        with self._lock:
+            cancelled = [self._runs[rid] for rid, f in self._futures.items() if f.cancelled() and rid in self._runs]
+        for run in cancelled:
+            run.set_status("failed", "Cancelled: server shutting down before the run started")
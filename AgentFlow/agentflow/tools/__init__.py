@@ -1 +1,6 @@
 # Tools package
+#
+# Research tools are plugged in per plan step: each tool is a callable
+# (step, user_goal) -> str returning extra context (search results, documents,
+# API data) that the researcher folds into that step's prompt.
+from agentflow.tools.registry import register_research_tool, get_research_tools, gather_context
@@ -0,0 +1,46 @@
+import os
+import logging
+from typing import Callable, Dict, List
+
+from agentflow.metrics import span
+
+logger = logging.getLogger(__name__)
+
+ResearchTool = Callable[[str, str], str]
+
+_research_tools: Dict[str, ResearchTool] = {}
+
+def register_research_tool(name: str, tool: ResearchTool):
+    """Registers a per-step research tool; later registrations replace earlier ones of the same name."""
+    _research_tools[name] = tool
+
+def get_research_tools() -> List[ResearchTool]:
+    _load_builtin_tools()
+    return list(_research_tools.values())
+
+def gather_context(step: str, user_goal: str) -> str:
+    """Runs every registered tool for one plan step; a failing tool is skipped, not fatal."""
+    _load_builtin_tools()
+    sections = []
+    for name, tool in list(_research_tools.items()):
+        try:
+            with span("tool", name):
+                result = tool(step, user_goal)
+        except Exception as e:
+            logger.error("Research tool '%s' failed for step '%s': %s", name, step, e)
+            continue
+        if result:
+            sections.append(f"[{name}]\n{result}")
+    return "\n\n".join(sections)
+
+_builtins_loaded = False
+
+def _load_builtin_tools():
+    global _builtins_loaded
+    if _builtins_loaded:
+        return
+    _builtins_loaded = True
+    # Web search is only enabled when a Tavily key is configured
+    if os.getenv("TAVILY_API_KEY") and "your_key_here" not in os.getenv("TAVILY_API_KEY", ""):
+        from agentflow.tools.search import tavily_search
+        register_research_tool("web_search", tavily_search)
@@ -0,0 +1,15 @@
+import os
+
+_client = None
+
+def tavily_search(step: str, user_goal: str, max_results: int = 3) -> str:
+    """Web search for one plan step via Tavily; returns a compact list of sources and snippets."""
+    global _client
+    if _client is None:
+        from tavily import TavilyClient
+        _client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+    response = _client.search(f"{user_goal} - {step}", max_results=max_results)
+    lines = []
+    for item in response.get("results", []):
+        lines.append(f"- {item.get('title')} ({item.get('url')}): {item.get('content', '')[:500]}")
+    return "\n".join(lines)
@@ -0,0 +1,161 @@
+"""
+End-to-end latency benchmark for AgentFlow, runnable offline.
+
+"graph" mode drives define_workflow().stream() in-process from a thread pool;
+"api" mode drives POST /run on a running AgentFlow API and follows each run
+until it finishes. Both report p50/p95/p99 latency, throughput and a per-node
+(stage) breakdown. With --fake (the default) the LLM is the deterministic
+stand-in from agentflow.fake_llm, so the numbers are our own overhead plus
+the simulated model latency. For "api" mode, start the server with
+AGENTFLOW_LLM_PROVIDER=fake to get the same effect.
+
+Usage (from the AgentFlow directory):
+    python -m benchmarks.e2e graph --runs 50 --concurrency 8 --latency uniform:0.05,0.2
+    python -m benchmarks.e2e api --url http://localhost:8000 --runs 50 --concurrency 4
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+GOALS = [
+    "Analyze whether we should launch an AI customer support agent for a fintech startup in India.",
+    "Draft a go-to-market plan for a B2B analytics product targeting mid-size logistics companies.",
+    "Write a one-page incident postmortem template for a SaaS platform team.",
+]
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def initial_state(goal):
+    return {
+        "user_goal": goal,
+        "plan": [],
+        "research_notes": "",
+        "draft_output": "",
+        "validation_feedback": "",
+        "revision_target": None,
+        "feedback_issues": [],
+        "approved": False,
+        "retry_count": 0,
+        "current_step": 0,
+        "llm_calls": []
+    }
+
+
+def graph_run(workflow, goal, config):
+    """One in-process run: (total seconds, {node: seconds}) from update timestamps."""
+    stages = defaultdict(float)
+    start = last = time.perf_counter()
+    for event in workflow.stream(initial_state(goal), config, stream_mode="updates"):
+        now = time.perf_counter()
+        for node in event:
+            stages[node] += now - last
+        last = now
+    return last - start, dict(stages)
+
+
+def _http(method, url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        return json.loads(resp.read())
+
+
+def api_run(base_url, goal, poll_interval):
+    """One run through the API: submit, poll until finished, then read per-node timings from its log."""
+    run_id = _http("POST", f"{base_url}/run", {"goal": goal, "use_cache": False})["run_id"]
+    while True:
+        summary = _http("GET", f"{base_url}/runs/{run_id}")
+        if summary["status"] in ("completed", "failed"):
+            break
+        time.sleep(poll_interval)
+    if summary["status"] == "failed":
+        raise RuntimeError(summary.get("error"))
+    stages = defaultdict(float)
+    stages["queue"] = summary["started_at"] - summary["created_at"]
+    last = summary["started_at"]
+    for entry in _http("GET", f"{base_url}/runs/{run_id}/logs")["logs"]:
+        stages[entry["node"]] += entry["ts"] - last
+        last = entry["ts"]
+    return summary["finished_at"] - summary["created_at"], dict(stages)
+
+
+def run_load(fn, runs, concurrency):
+    results, errors = [], 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(fn, GOALS[i % len(GOALS)]) for i in range(runs)]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                errors += 1
+                print(f"run failed: {e}")
+    return results, errors, time.perf_counter() - start
+
+
+def report(results, errors, elapsed, concurrency):
+    totals = [t * 1000 for t, _ in results]
+    print(f"runs={len(results)} errors={errors} concurrency={concurrency} "
+          f"throughput={len(results) / elapsed if elapsed else 0:.2f} runs/s")
+    print(f"\n{'stage':<12} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    stages = defaultdict(list)
+    for _, per_node in results:
+        for node, seconds in per_node.items():
+            stages[node].append(seconds * 1000)
+    for name, samples in list(stages.items()) + [("TOTAL", totals)]:
+        if samples:
+            print(f"{name:<12} {statistics.mean(samples):>9.1f} {percentile(samples, 0.50):>9.1f} "
+                  f"{percentile(samples, 0.95):>9.1f} {percentile(samples, 0.99):>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentFlow end-to-end latency benchmark")
+    parser.add_argument("mode", choices=["graph", "api"])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--url", default="http://localhost:8000", help="AgentFlow API base URL (api mode)")
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--real-llm", action="store_true", help="Use the configured provider instead of the fake")
+    parser.add_argument("--latency", default="uniform:0.05,0.2", help="Fake LLM latency distribution")
+    parser.add_argument("--reject-rate", type=float, default=0.2, help="Fake validator rejection probability")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoint", default="none", help="Checkpointer for graph mode: none, memory, sqlite:///...")
+    args = parser.parse_args()
+
+    if not args.real_llm:
+        os.environ["AGENTFLOW_LLM_PROVIDER"] = "fake"
+        os.environ["AGENTFLOW_FAKE_LLM_LATENCY"] = args.latency
+        os.environ["AGENTFLOW_FAKE_LLM_REJECT_RATE"] = str(args.reject_rate)
+        os.environ["AGENTFLOW_FAKE_LLM_SEED"] = str(args.seed)
+    # Every run should pay for its LLM calls
+    os.environ["AGENTFLOW_LLM_CACHE"] = "false"
+
+    if args.mode == "graph":
+        # Imported after the environment is set: the LLM registry reads it on first use
+        from agentflow.checkpoint import create_checkpointer, run_config
+        from agentflow.graph.workflow import define_workflow
+        checkpointer = create_checkpointer(args.checkpoint)
+        workflow = define_workflow(checkpointer=checkpointer)
+        counter = iter(range(1 << 30))
+        fn = lambda goal: graph_run(workflow, goal, run_config(f"bench-{time.time_ns()}-{next(counter)}"))
+    else:
+        fn = lambda goal: api_run(args.url.rstrip("/"), goal, args.poll_interval)
+
+    # Warm-up: imports, graph compile, connection setup
+    run_load(fn, min(args.concurrency, 2), min(args.concurrency, 2))
+    report(*run_load(fn, args.runs, args.concurrency), args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
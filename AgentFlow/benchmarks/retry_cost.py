@@ -0,0 +1,81 @@
+"""
+Counts LLM calls and tokens per completed run for each retry strategy.
+
+"full" is the original loop (every rejection re-runs planner, researcher and
+executor); "incremental" routes the rejection to the node the validator
+blames and lets the executor edit its existing draft.
+
+Usage (from the AgentFlow directory; makes real LLM calls):
+    python -m benchmarks.retry_cost --runs 3
+"""
+import argparse
+import statistics
+import time
+
+from dotenv import load_dotenv
+
+from agentflow.graph.workflow import define_workflow
+from agentflow.llm import registry
+from agentflow.llm_cache import cache_bypass
+
+DEFAULT_GOALS = [
+    "Analyze whether we should launch an AI customer support agent for a fintech startup in India. Consider cost, compliance, and ROI.",
+    "Draft a go-to-market plan for a B2B analytics product targeting mid-size logistics companies.",
+    "Write a one-page incident postmortem template for a SaaS platform team.",
+]
+
+
+def initial_state(goal):
+    return {
+        "user_goal": goal,
+        "plan": [],
+        "research_notes": "",
+        "draft_output": "",
+        "validation_feedback": "",
+        "revision_target": None,
+        "feedback_issues": [],
+        "approved": False,
+        "retry_count": 0,
+        "current_step": 0,
+        "llm_calls": []
+    }
+
+
+def measure(strategy, goals, runs):
+    workflow = define_workflow(retry_strategy=strategy)
+    samples = []
+    for i in range(runs):
+        goal = goals[i % len(goals)]
+        registry.reset_usage()
+        start = time.perf_counter()
+        # Cached responses would hide the cost difference being measured
+        with cache_bypass():
+            final = workflow.invoke(initial_state(goal))
+        usage = registry.usage()
+        samples.append({
+            **usage,
+            "retries": final.get("retry_count", 0),
+            "approved": bool(final.get("approved")),
+            "seconds": time.perf_counter() - start,
+        })
+    return samples
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="LLM calls/tokens per run: full vs incremental retries")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per strategy")
+    parser.add_argument("--strategies", default="full,incremental")
+    args = parser.parse_args()
+
+    print(f"{'strategy':<12} {'calls':>7} {'in tok':>9} {'out tok':>9} {'retries':>8} {'approved':>9} {'sec':>7}")
+    for strategy in args.strategies.split(","):
+        samples = measure(strategy, DEFAULT_GOALS, args.runs)
+        mean = lambda k: statistics.mean(s[k] for s in samples)
+        approved = sum(s["approved"] for s in samples)
+        print(f"{strategy:<12} {mean('calls'):>7.1f} {mean('input_tokens'):>9.0f} {mean('output_tokens'):>9.0f} "
+              f"{mean('retries'):>8.1f} {approved:>5}/{len(samples):<3} {mean('seconds'):>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Measures the per-request cost of building the LangGraph workflow.
+
+Compares the old request path (define_workflow() + draw_mermaid() on every
+/run and /graph) with the cached singleton served by get_workflow() and
+get_workflow_mermaid(). No LLM calls are made.
+
+Usage (from the AgentFlow directory):
+    python -m benchmarks.workflow_compile --iterations 50
+"""
+import argparse
+import statistics
+import time
+
+from agentflow.graph.workflow import define_workflow, get_workflow, get_workflow_mermaid
+
+
+def _time(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:<34} mean={statistics.mean(samples):9.3f} ms  p50={statistics.median(samples):9.3f} ms  p95={p95:9.3f} ms")
+    return statistics.mean(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workflow compile/reuse benchmark")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    get_workflow_mermaid()
+    print(f"Startup (compile + render once): {(time.perf_counter() - start) * 1000:.3f} ms\n")
+
+    before_run = _report("/run before (define_workflow)", _time(define_workflow, args.iterations))
+    after_run = _report("/run after (get_workflow)", _time(get_workflow, args.iterations))
+    before_graph = _report(
+        "/graph before (compile + mermaid)",
+        _time(lambda: define_workflow().get_graph().draw_mermaid(), args.iterations),
+    )
+    after_graph = _report("/graph after (cached mermaid)", _time(get_workflow_mermaid, args.iterations))
+
+    print(f"\nSpeedup: /run x{before_run / max(after_run, 1e-6):.0f}, /graph x{before_graph / max(after_graph, 1e-6):.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,8 +17,12 @@ def run_demo():
         "research_notes": "",
         "draft_output": "",
         "validation_feedback": "",
+        "revision_target": None,
+        "feedback_issues": [],
+        "approved": False,
         "retry_count": 0,
-        "current_step": 0
+        "current_step": 0,
+        "llm_calls": []
     }
     
     # Run the graph
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import agentflow the way test_run.py does, from the AgentFlow directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
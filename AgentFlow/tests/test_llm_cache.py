@@ -0,0 +1,33 @@
+import pytest
+
+from agentflow.llm_cache import LLMCache, cache_key
+
+PROMPT = "Summarize the plan."
+
+
+def test_key_depends_on_provider():
+    fake = cache_key("agentflow-fake", "gemini-2.0-flash", 0, {}, PROMPT)
+    google = cache_key("chat-google-generative-ai", "gemini-2.0-flash", 0, {}, PROMPT)
+    assert fake != google
+
+
+def test_fake_entry_is_not_a_hit_for_google(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"))
+    cache.put(cache_key("agentflow-fake", "gemini-2.0-flash", 0, {}, PROMPT), "gemini-2.0-flash", "canned", {})
+    assert cache.get(cache_key("chat-google-generative-ai", "gemini-2.0-flash", 0, {}, PROMPT)) is None
+
+
+def test_fake_client_entries_stay_out_of_google_lookups(tmp_path, monkeypatch):
+    pytest.importorskip("langchain_core")
+    pytest.importorskip("langchain_google_genai")
+    from agentflow.llm import LLMClient
+    import threading
+
+    monkeypatch.setenv("AGENTFLOW_LLM_PROVIDER", "fake")
+    cache = LLMCache(str(tmp_path / "cache.sqlite"))
+    client = LLMClient("gemini-2.0-flash", 0, threading.BoundedSemaphore(1), cache=cache)
+    client.invoke(PROMPT)
+
+    assert client.provider == "agentflow-fake"
+    assert cache.get(cache_key(client.provider, "gemini-2.0-flash", 0, {}, PROMPT)) is not None
+    assert cache.get(cache_key("chat-google-generative-ai", "gemini-2.0-flash", 0, {}, PROMPT)) is None
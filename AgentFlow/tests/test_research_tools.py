@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("prometheus_client")
+
+from agentflow.tools import registry
+
+
+@pytest.fixture
+def clean_registry(monkeypatch):
+    monkeypatch.setattr(registry, "_research_tools", {})
+    monkeypatch.setattr(registry, "_builtins_loaded", False)
+    monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+
+
+class RecordingLLM:
+    """Stands in for an LLMClient and keeps the prompts it was given."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return type("Reply", (), {"content": "findings"})()
+
+
+def test_gather_context_loads_builtin_tools(clean_registry, monkeypatch):
+    from agentflow.tools import search
+    monkeypatch.setenv("TAVILY_API_KEY", "tvly-test")
+    # No network in tests: the registry picks up this stand-in for the Tavily call
+    monkeypatch.setattr(search, "tavily_search", lambda step, goal: f"results for {step}")
+
+    context = registry.gather_context("Market size", "Launch a product")
+
+    assert "web_search" in registry._research_tools
+    assert context == "[web_search]\nresults for Market size"
+
+
+def test_registered_tool_output_reaches_step_prompt(clean_registry):
+    pytest.importorskip("langchain_core")
+    pytest.importorskip("langchain_google_genai")
+    from agentflow.agents.researcher import research_step
+
+    registry.register_research_tool("docs", lambda step, goal: f"notes for {step}")
+    llm = RecordingLLM()
+
+    research_step(llm, "Launch a product", ["Market size"], "Market size")
+
+    assert "[docs]\nnotes for Market size" in llm.prompts[0]
@@ -0,0 +1,121 @@
+"""
+End-to-end benchmark for the Sales Consumer API (/ask).
+
+Streams POST /ask/stream at a running consumer API from a pool of client
+threads and times each SSE stage: intent planning (LLM), MCP evidence,
+time to first recommendation token and the full answer. Reports
+p50/p95/p99 per stage, plus throughput.
+
+To measure our own overhead without a Gemini key, run the stack with
+agent.provider: fake in config.yaml (simulated LLM latency is set under
+agent.fake) against a local Postgres seeded with database/seed.py.
+
+Usage (from the SalesMCP directory, with the MCP server and consumer API running):
+    python -m benchmarks.ask_load --requests 100 --concurrency 8
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_QUESTIONS = [
+    "Give me a summary of the sales pipeline",
+    "Which deals are stalled?",
+    "Which deals should I prioritize today?",
+    "What is our discount policy?",
+    "Show me the deals for owner Alice and evaluate their risk",
+]
+
+_local = threading.local()
+
+
+def _session():
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))] if samples else 0.0
+
+
+def ask(base_url, question, timeout):
+    """One streamed /ask: returns {stage: ms} (cumulative from request start) or raises on error."""
+    marks = {}
+    start = time.perf_counter()
+    with _session().post(f"{base_url}/ask/stream", json={"question": question}, stream=True, timeout=timeout) as resp:
+        resp.raise_for_status()
+        event = None
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                elapsed = (time.perf_counter() - start) * 1000
+                if event == "error":
+                    raise RuntimeError(json.loads(line[len("data: "):]).get("error"))
+                # First occurrence of each event marks the end of a stage
+                marks.setdefault(event, elapsed)
+    if "done" not in marks:
+        raise RuntimeError("stream ended without a result")
+    stages = {"total": marks["done"]}
+    if "plan" in marks:
+        stages["intent_llm"] = marks["plan"]
+        stages["mcp_tools"] = marks["evidence"] - marks["plan"]
+        stages["first_token"] = marks.get("token", marks["done"]) - marks["evidence"]
+        stages["recommendation_llm"] = marks["done"] - marks["evidence"]
+    else:
+        stages["cache_hit"] = marks["done"]
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent end-to-end benchmark for /ask")
+    parser.add_argument("--url", default="http://localhost:8000", help="Consumer API base URL")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--repeat-questions", action="store_true",
+                        help="Reuse identical questions (measures the response cache); by default each is unique")
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip("/")
+    questions = [
+        DEFAULT_QUESTIONS[i % len(DEFAULT_QUESTIONS)] + ("" if args.repeat_questions else f" (run {time.time_ns()}-{i})")
+        for i in range(args.requests)
+    ]
+
+    def one(question):
+        try:
+            return ask(base_url, question, args.timeout)
+        except Exception as e:
+            print(f"request failed: {e}")
+            return None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one, questions))
+    elapsed = time.perf_counter() - start
+
+    ok = [r for r in results if r is not None]
+    print(f"requests={len(results)} errors={len(results) - len(ok)} concurrency={args.concurrency} "
+          f"throughput={len(ok) / elapsed if elapsed else 0:.2f} req/s")
+    stages = defaultdict(list)
+    for r in ok:
+        for name, ms in r.items():
+            stages[name].append(ms)
+    print(f"\n{'stage':<20} {'n':>5} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name in ("intent_llm", "mcp_tools", "first_token", "recommendation_llm", "cache_hit", "total"):
+        samples = stages.get(name)
+        if samples:
+            print(f"{name:<20} {len(samples):>5} {statistics.mean(samples):>9.1f} {percentile(samples, 0.50):>9.1f} "
+                  f"{percentile(samples, 0.95):>9.1f} {percentile(samples, 0.99):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
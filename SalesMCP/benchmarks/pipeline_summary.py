@@ -0,0 +1,132 @@
+"""
+Pipeline summary benchmark: GROUP BY scan of deals vs the trigger-maintained
+deal_pipeline_agg table.
+
+Builds a scratch database (default salesmcp_bench) from schema.sql, seeds it
+with synthetic deals via database.seed.generate(), checks that both paths agree, then times each
+path company-wide and for a single owner. With --write-overhead it also
+measures what the triggers add to single-row deal updates.
+
+Usage (from the SalesMCP directory; needs the Postgres from config.yaml):
+    python -m benchmarks.pipeline_summary --deals 1000000 --iterations 20
+    python -m benchmarks.pipeline_summary --skip-seed --write-overhead
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+from database.manager import DatabaseManager
+from database.seed import generate
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml")
+if not os.path.exists(CONFIG_PATH):
+    CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml.example")
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "database", "schema.sql")
+
+STAGES = ["Discovery", "Qualification", "Proposal", "Negotiation", "Closing", "Closed Won", "Closed Lost"]
+
+SCAN_SQL = """
+    SELECT stage, COUNT(*) as count, SUM(deal_value) as total_value
+    FROM deals
+    WHERE (%(owner_id)s::int IS NULL OR owner_id = %(owner_id)s)
+    GROUP BY stage
+"""
+AGG_SQL = """
+    SELECT a.stage, SUM(a.deal_count)::bigint as count, SUM(a.total_value)::float8 as total_value
+    FROM deal_pipeline_agg a
+    WHERE (%(owner_id)s::int IS NULL OR a.owner_id = %(owner_id)s)
+    GROUP BY a.stage
+"""
+
+
+def seed(db, deals, owners, customers, batch, rng_seed):
+    # One COPY per table: the aggregate triggers fire once for the whole load
+    generate(db, {"users": owners, "customers": customers, "deals": deals},
+             seed=rng_seed, truncate=True, chunk_rows=batch)
+    db.execute("ANALYZE deals")
+
+
+def check(db):
+    scan = {r["stage"]: r for r in db.query(SCAN_SQL, {"owner_id": None})}
+    agg = {r["stage"]: r for r in db.query(AGG_SQL, {"owner_id": None})}
+    assert scan.keys() == agg.keys(), f"stage mismatch: {sorted(scan)} vs {sorted(agg)}"
+    for stage, row in scan.items():
+        assert row["count"] == agg[stage]["count"], f"{stage}: count {row['count']} vs {agg[stage]['count']}"
+        assert abs(row["total_value"] - agg[stage]["total_value"]) <= 1e-6 * max(1.0, abs(row["total_value"])), stage
+    print(f"  aggregate matches scan across {len(scan)} stages")
+
+
+def timed(db, sql, params, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        db.query(sql, params)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.mean(samples), statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+def write_overhead(db, updates, rng):
+    ids = [r["id"] for r in db.query("SELECT id FROM deals ORDER BY random() LIMIT %s", (updates,))]
+
+    def run():
+        start = time.perf_counter()
+        for deal_id in ids:
+            db.execute("UPDATE deals SET stage = %s WHERE id = %s", (rng.choice(STAGES), deal_id))
+        return (time.perf_counter() - start) * 1000 / len(ids)
+
+    with_triggers = run()
+    for t in ("ins", "upd", "del", "trunc"):
+        db.execute(f"ALTER TABLE deals DISABLE TRIGGER trg_deals_pipeline_{t}")
+    try:
+        without = run()
+    finally:
+        for t in ("ins", "upd", "del", "trunc"):
+            db.execute(f"ALTER TABLE deals ENABLE TRIGGER trg_deals_pipeline_{t}")
+        db.query("SELECT rebuild_deal_pipeline_agg()")
+    print(f"  single-row UPDATE: {with_triggers:.3f} ms with aggregate triggers, {without:.3f} ms without")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline summary: scan vs materialized aggregate")
+    parser.add_argument("--dbname", default="salesmcp_bench", help="Scratch database (created if missing, data replaced)")
+    parser.add_argument("--deals", type=int, default=1_000_000)
+    parser.add_argument("--owners", type=int, default=50)
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=50_000, help="Rows encoded per COPY chunk")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in --dbname")
+    parser.add_argument("--write-overhead", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    db = DatabaseManager(CONFIG_PATH, dbname=args.dbname)
+    db.setup_database(SCHEMA_PATH)
+    try:
+        if not args.skip_seed:
+            seed(db, args.deals, args.owners, args.customers, args.batch, args.seed)
+        check(db)
+
+        owner = {"owner_id": 1}
+        print(f"\n{'query':<28} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10}")
+        for label, sql, params in (
+            ("scan (company)", SCAN_SQL, {"owner_id": None}),
+            ("aggregate (company)", AGG_SQL, {"owner_id": None}),
+            ("scan (one owner)", SCAN_SQL, owner),
+            ("aggregate (one owner)", AGG_SQL, owner),
+        ):
+            mean, p50, p95 = timed(db, sql, params, args.iterations)
+            print(f"{label:<28} {mean:>10.2f} {p50:>10.2f} {p95:>10.2f}")
+
+        if args.write_overhead:
+            print()
+            write_overhead(db, 1000, rng)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Query-plan regression suite for the MCPTools queries.
+
+Builds a scratch database (default salesmcp_bench) from schema.sql plus the
+migrations, seeds a large synthetic dataset, then runs every MCPTools read
+capability (and the /history query) with each SELECT wrapped in
+EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON). Exits non-zero if any plan falls
+back to a sequential scan of a table holding at least --min-rows rows;
+smaller tables are allowed to be scanned since that is what the planner
+should do there.
+
+Usage (from the SalesMCP directory; needs the Postgres from config.yaml):
+    python -m benchmarks.query_plans --scale 1
+    python -m benchmarks.query_plans --skip-seed --verbose
+"""
+import argparse
+import os
+import sys
+
+from database.manager import DatabaseManager
+from database.seed import generate
+from mcp_server.tools import MCPTools
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml")
+if not os.path.exists(CONFIG_PATH):
+    CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml.example")
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "database", "schema.sql")
+
+# Rows per table at --scale 1
+BASE_ROWS = {
+    "users": 5_000,
+    "customers": 100_000,
+    "deals": 1_000_000,
+    "activities": 3_000_000,
+    "policies": 5_000,
+    "agent_decisions": 200_000,
+}
+
+HISTORY_SQL = "SELECT * FROM agent_decisions ORDER BY created_at DESC LIMIT 10"
+
+
+def seed(db, rows, rng_seed):
+    """
+    database.seed.generate() loads the sales tables (most deals closed, most
+    open deals touched within the week, so the stalled-deal predicate stays
+    selective); agent decisions are generated server-side.
+    """
+    generate(db, rows, seed=rng_seed, truncate=True)
+    with db.connection() as conn, conn.cursor() as cur:
+        cur.execute("TRUNCATE agent_decisions RESTART IDENTITY")
+        # setseed() makes random() repeatable for this session
+        cur.execute("SELECT setseed(%s)", ((rng_seed % 1000) / 1000.0,))
+        cur.execute(
+            "INSERT INTO agent_decisions (agent_name, input_question, recommendation, confidence, evidence, created_at) "
+            "SELECT 'SalesAgent', 'Question ' || i, 'Recommendation ' || i, random(), '{}'::jsonb, "
+            "NOW() - random() * INTERVAL '180 days' FROM generate_series(1, %s) i", (rows["agent_decisions"],))
+    for table in rows:
+        db.execute(f"ANALYZE {table}")
+
+
+class ExplainingDB:
+    """
+    Stands in for DatabaseManager inside MCPTools: every SELECT is first run
+    under EXPLAIN ANALYZE and its plan kept, then run for real so the tool
+    gets its rows back and carries on as usual.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.plans = []
+        self.label = None
+
+    def query(self, sql, params=None):
+        if sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            row = self.db.query("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+            self.plans.append((self.label, row[0]["QUERY PLAN"][0]))
+        return self.db.query(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if an MCPTools query sequentially scans a large table")
+    parser.add_argument("--dbname", default="salesmcp_bench", help="Scratch database (created if missing, data replaced)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier on the default row counts")
+    parser.add_argument("--min-rows", type=int, default=2_000,
+                        help="Sequential scans of tables at least this large count as failures")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in --dbname")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan node")
+    args = parser.parse_args()
+
+    rows = {t: max(1, int(n * args.scale)) for t, n in BASE_ROWS.items()}
+    db = DatabaseManager(CONFIG_PATH, dbname=args.dbname)
+    db.setup_database(SCHEMA_PATH)
+    try:
+        if not args.skip_seed:
+            seed(db, rows, args.seed)
+        sizes = {r["relname"]: r["reltuples"] for r in db.query(
+            "SELECT relname, reltuples FROM pg_class WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace")}
+
+        explaining = ExplainingDB(db)
+        tools = MCPTools(explaining)
+        probe_owner = max(1, rows["users"] // 2)
+        probe_name = db.query("SELECT name FROM users WHERE id = %s", (probe_owner,))[0]["name"]
+        cases = [
+            ("get_sales_pipeline_summary", lambda: tools.get_sales_pipeline_summary(owner_id=probe_owner)),
+            ("get_deals_by_owner", lambda: tools.get_deals_by_owner(probe_name)),
+            ("get_customer_profile", lambda: tools.get_customer_profile(max(1, rows["customers"] // 2))),
+            ("get_stalled_deals", tools.get_stalled_deals),
+            ("evaluate_deal_risk", lambda: tools.evaluate_deal_risk(max(1, rows["deals"] // 2))),
+            ("prioritize_deals (company)", lambda: tools.prioritize_deals_for_today()),
+            ("prioritize_deals (owner)", lambda: tools.prioritize_deals_for_today(owner_id=probe_owner)),
+            ("check_sales_policy", lambda: tools.check_sales_policy(f"Policy {max(1, rows['policies'] // 2)}")),
+            ("history", lambda: explaining.query(HISTORY_SQL)),
+        ]
+        for label, call in cases:
+            explaining.label = label
+            call()
+
+        failures = []
+        print(f"\n{'query':<30} {'exec ms':>10}  scans")
+        for label, plan in explaining.plans:
+            scans = []
+            for node in plan_nodes(plan["Plan"]):
+                if args.verbose:
+                    print(f"{'':<42}{node['Node Type']} {node.get('Relation Name', '')} {node.get('Index Name', '')}")
+                relation = node.get("Relation Name")
+                if relation is None:
+                    continue
+                scans.append(f"{node['Node Type']}({node.get('Index Name') or relation})")
+                if node["Node Type"] == "Seq Scan" and sizes.get(relation, 0) >= args.min_rows:
+                    failures.append((label, relation, sizes[relation]))
+            print(f"{label:<30} {plan['Execution Time']:>10.2f}  {', '.join(scans)}")
+
+        if failures:
+            print()
+            for label, relation, n in failures:
+                print(f"FAIL {label}: sequential scan of {relation} (~{n:,.0f} rows)")
+            sys.exit(1)
+        print(f"\nOK: no sequential scans of tables with >= {args.min_rows:,} rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
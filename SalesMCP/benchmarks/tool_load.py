@@ -0,0 +1,99 @@
+"""
+Load benchmark for the MCP Producer Server.
+
+Fires concurrent GET /tools/{tool_name} requests at a running server and
+reports throughput and latency per concurrency level. With tool calls offloaded
+from the event loop, throughput should scale with concurrency until the DB
+pool (or the worker pool) saturates, instead of flatlining at serial speed.
+
+Usage (from the SalesMCP directory, with the MCP server running):
+    python -m benchmarks.tool_load --levels 1,2,4,8,16 --requests 200
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_MIX = [
+    ("get_sales_pipeline_summary", {}),
+    ("get_stalled_deals", {}),
+    ("prioritize_deals_for_today", {}),
+    ("get_deals_by_owner", {"param": "Alice"}),
+    ("evaluate_deal_risk", {"id": 1}),
+    ("get_customer_profile", {"id": 1}),
+]
+
+_local = threading.local()
+
+
+def _session():
+    # One keep-alive session per client thread so we measure the server, not TCP setup
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def _call(base_url, tool_name, params, timeout):
+    start = time.perf_counter()
+    try:
+        resp = _session().get(f"{base_url}/tools/{tool_name}", params=params, timeout=timeout)
+        ok = resp.status_code == 200
+    except requests.RequestException:
+        ok = False
+    return ok, (time.perf_counter() - start) * 1000
+
+
+def run_level(base_url, concurrency, total_requests, timeout, mix=DEFAULT_MIX):
+    calls = [mix[i % len(mix)] for i in range(total_requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda c: _call(base_url, c[0], c[1], timeout), calls))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(ms for _, ms in results)
+    errors = sum(1 for ok, _ in results if not ok)
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": total_requests / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load benchmark for MCP tool calls")
+    parser.add_argument("--url", default="http://localhost:8001", help="MCP server base URL")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    # Warm up connections on both sides before measuring
+    run_level(args.url, max(levels), min(args.requests, 20), args.timeout)
+
+    print(f"{'conc':>5} {'req':>6} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'scale':>6}")
+    baseline = None
+    for level in levels:
+        r = run_level(args.url, level, args.requests, args.timeout)
+        baseline = baseline or r["throughput_rps"]
+        scale = r["throughput_rps"] / baseline if baseline else 0.0
+        print(f"{r['concurrency']:>5} {r['requests']:>6} {r['errors']:>5} {r['throughput_rps']:>9.1f} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {scale:>5.1f}x")
+
+    try:
+        stats = requests.get(f"{args.url}/pool/stats", timeout=args.timeout).json()
+        print(f"\nDB pool: in_use={stats.get('in_use')} size={stats.get('size')} "
+              f"waits={stats.get('waits')} max_wait_ms={stats.get('max_wait_ms')}")
+    except requests.RequestException:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,156 @@
 import os
+import logging
+import threading
 import yaml
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from database.pool import ConnectionPool
+from observability.metrics import span, statement_name
+
+logger = logging.getLogger(__name__)
+
+def build_dsn(params):
+    return f"host={params['host']} port={params['port']} dbname={params['dbname']} user={params['user']} password={params['password']} sslmode={params['sslmode']}"
 
 class DatabaseManager:
-    def __init__(self, config_path):
+    def __init__(self, config_path, dbname=None):
         with open(config_path, 'r') as f:
             self.config = yaml.safe_load(f)['database']
+        if dbname:
+            # e.g. a scratch database for benchmarks
+            self.config['dbname'] = dbname
         
-        self.conn_str = f"host={self.config['host']} port={self.config['port']} dbname={self.config['dbname']} user={self.config['user']} password={self.config['password']} sslmode={self.config['sslmode']}"
+        self.conn_str = build_dsn(self.config)
+        self.pool_config = self.config.get('pool') or {}
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        # Created lazily: setup_database() may still have to create the target DB
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool.from_config(self.conn_str, self.pool_config)
+        return self._pool
 
     def get_connection(self, dbname=None):
+        """Opens a dedicated, unpooled connection (used for admin work such as schema setup)."""
+        if not dbname:
+            return psycopg2.connect(self.conn_str, cursor_factory=RealDictCursor)
         conn_params = self.config.copy()
-        if dbname:
-            conn_params['dbname'] = dbname
-        
-        conn_str = f"host={conn_params['host']} port={conn_params['port']} dbname={conn_params['dbname']} user={conn_params['user']} password={conn_params['password']} sslmode={conn_params['sslmode']}"
-        return psycopg2.connect(conn_str, cursor_factory=RealDictCursor)
+        conn_params['dbname'] = dbname
+        return psycopg2.connect(build_dsn(conn_params), cursor_factory=RealDictCursor)
+
+    def connection(self):
+        """Checks out a pooled connection; use as a context manager."""
+        return self.pool.connection()
+
+    def pool_stats(self):
+        if self._pool is None:
+            return {"status": "not_initialized", **self.pool_config}
+        return self._pool.stats()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
 
     def setup_database(self, schema_path):
         target_db = self.config['dbname']
         
         # 1. Connect to 'postgres' to check/create the target database
         try:
-            print(f"Ensuring database '{target_db}' exists...")
+            logger.info("Ensuring database '%s' exists...", target_db)
             conn = self.get_connection(dbname='postgres')
             conn.autocommit = True
             with conn.cursor() as cur:
                 cur.execute(f"SELECT 1 FROM pg_database WHERE datname = %s", (target_db,))
                 if not cur.fetchone():
-                    print(f"Database '{target_db}' not found. Creating...")
+                    logger.info("Database '%s' not found. Creating...", target_db)
                     cur.execute(f'CREATE DATABASE "{target_db}"')
             conn.close()
         except Exception as e:
-            print(f"Warning: Could not check/create database: {e}")
+            logger.warning("Could not check/create database: %s", e)
 
         # 2. Connect to the target database and run schema
-        print(f"Setting up schema for '{target_db}'...")
+        logger.info("Setting up schema for '%s'...", target_db)
         conn = self.get_connection()
         conn.autocommit = True
         with conn.cursor() as cur:
             with open(schema_path, 'r') as f:
                 cur.execute(f.read())
         conn.close()
-        print("Schema created successfully.")
+        logger.info("Schema created successfully.")
+
+        self.apply_migrations(os.path.join(os.path.dirname(schema_path), "migrations"))
+
+    def apply_migrations(self, migrations_dir):
+        """
+        Applies NNN_name.sql files from `migrations_dir` in order, each in its
+        own transaction together with its schema_migrations row, skipping
+        versions already recorded. Returns the versions applied.
+        """
+        if not os.path.isdir(migrations_dir):
+            return []
+        applied = []
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT version FROM schema_migrations")
+                done = {r['version'] for r in cur.fetchall()}
+            conn.commit()
+            for name in sorted(f for f in os.listdir(migrations_dir) if f.endswith(".sql")):
+                version = name[:-len(".sql")]
+                if version in done:
+                    continue
+                logger.info("Applying migration %s...", version)
+                with open(os.path.join(migrations_dir, name), 'r') as f:
+                    sql = f.read()
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute(sql)
+                        cur.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+                    conn.commit()
+                    # e.g. RAISE WARNING from a migration that skipped an optional step
+                    for notice in conn.notices:
+                        logger.warning("Migration %s: %s", version, notice.strip())
+                    del conn.notices[:]
+                except Exception:
+                    conn.rollback()
+                    logger.error("Migration %s failed; later migrations not applied.", version)
+                    raise
+                applied.append(version)
+        finally:
+            conn.close()
+        return applied
 
     def seed_data(self, seed_script_path):
-        print("Seeding database...")
+        logger.info("Seeding database...")
         # Since seeding is complex, we might import the seed module or run it
         import importlib.util
         spec = importlib.util.spec_from_file_location("seed_module", seed_script_path)
         seed_module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(seed_module)
         seed_module.run_seed(self)
-        print("Seeding completed.")
+        logger.info("Seeding completed.")
 
     def query(self, sql, params=None):
-        with self.get_connection() as conn:
+        with span("db", statement_name(sql)), self.connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(sql, params)
                 if cur.description:
                     return cur.fetchall()
                 return None
     
+    def execute_values(self, sql, rows, template=None, fetch=False, page_size=100):
+        """Multi-row insert in a single transaction: `sql` holds one VALUES %s placeholder."""
+        with span("db", statement_name(sql)), self.connection() as conn:
+            with conn.cursor() as cur:
+                return execute_values(cur, sql, rows, template=template, page_size=page_size, fetch=fetch)
+
     def execute(self, sql, params=None):
-        with self.get_connection() as conn:
-            conn.autocommit = True
+        with span("db", statement_name(sql)), self.connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(sql, params)
                 return cur.rowcount
@@ -0,0 +1,41 @@
+-- 001: indexes matching the MCPTools access patterns
+-- Applied once by DatabaseManager.apply_migrations(), inside a transaction.
+
+-- pg_trgm needs superuser, or CREATE on the database for a trusted extension (PG13+).
+-- Without it the trigram indexes below are skipped with a warning.
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+EXCEPTION WHEN insufficient_privilege OR undefined_file OR feature_not_supported THEN
+    RAISE WARNING 'pg_trgm unavailable (%); skipping trigram indexes', SQLERRM;
+END $$;
+
+-- get_stalled_deals: open deals by last_activity
+CREATE INDEX IF NOT EXISTS idx_deals_open_last_activity
+    ON deals (last_activity)
+    INCLUDE (customer_id, deal_value)
+    WHERE stage NOT IN ('Closed Won', 'Closed Lost');
+
+-- prioritize_deals_for_today: open deals by value then close date, company-wide and per owner
+CREATE INDEX IF NOT EXISTS idx_deals_open_priority
+    ON deals (deal_value DESC, expected_close_date ASC)
+    WHERE stage NOT IN ('Closed Won', 'Closed Lost');
+CREATE INDEX IF NOT EXISTS idx_deals_open_owner_priority
+    ON deals (owner_id, deal_value DESC, expected_close_date ASC)
+    WHERE stage NOT IN ('Closed Won', 'Closed Lost');
+
+-- get_customer_profile: a deal's activities, newest first (supersedes idx_activities_deal)
+CREATE INDEX IF NOT EXISTS idx_activities_deal_date ON activities (deal_id, activity_date DESC);
+DROP INDEX IF EXISTS idx_activities_deal;
+
+-- get_deals_by_owner / check_sales_policy: ILIKE '%name%' lookups
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+        CREATE INDEX IF NOT EXISTS idx_users_name_trgm ON users USING gin (name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_policies_name_trgm ON policies USING gin (policy_name gin_trgm_ops);
+    END IF;
+END $$;
+
+-- /history: latest agent decisions
+CREATE INDEX IF NOT EXISTS idx_agent_decisions_created ON agent_decisions (created_at DESC);
@@ -0,0 +1,5 @@
+-- 002: per-owner lookups on the pipeline aggregate
+-- get_sales_pipeline_summary(owner_id=...) filters on owner_id alone, which the
+-- (stage, owner_id) primary key cannot serve without a btree skip scan (Postgres 18+).
+
+CREATE INDEX IF NOT EXISTS idx_deal_pipeline_agg_owner ON deal_pipeline_agg (owner_id);
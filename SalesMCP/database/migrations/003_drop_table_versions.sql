@@ -0,0 +1,2 @@
+-- 003: result-cache invalidation is NOTIFY-only; the per-table version rows are unused
+DROP TABLE IF EXISTS table_versions;
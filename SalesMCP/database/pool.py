@@ -0,0 +1,238 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe psycopg2 connection pool.
+
+    Keeps between `min_size` and `max_size` connections open, validates each
+    connection on checkout, closes connections that sat idle longer than
+    `idle_timeout` (never dropping below `min_size`) and records saturation
+    stats so callers can see how often requests wait for a free connection.
+    """
+
+    def __init__(self, dsn, min_size=1, max_size=10, idle_timeout=300.0,
+                 checkout_timeout=30.0, health_check=True, reap_interval=60.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool bounds: min_size={min_size}, max_size={max_size}")
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check = health_check
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, returned_at) — most recently returned on the right
+        self._in_use = set()
+        self._opening = 0
+        self._closed = False
+        self._stop = threading.Event()
+
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "health_check_failures": 0,
+            "reaped": 0,
+        }
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+
+        self._reaper = None
+        if reap_interval and idle_timeout:
+            self._reaper = threading.Thread(
+                target=self._reap_loop, args=(reap_interval,), name="db-pool-reaper", daemon=True
+            )
+            self._reaper.start()
+
+    @classmethod
+    def from_config(cls, dsn, pool_config=None):
+        cfg = pool_config or {}
+        return cls(
+            dsn,
+            min_size=cfg.get("min_size", 1),
+            max_size=cfg.get("max_size", 10),
+            idle_timeout=cfg.get("idle_timeout", 300.0),
+            checkout_timeout=cfg.get("checkout_timeout", 30.0),
+            health_check=cfg.get("health_check", True),
+            reap_interval=cfg.get("reap_interval", 60.0),
+        )
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn, cursor_factory=RealDictCursor)
+        with self._cond:
+            self._stats["connections_opened"] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._stats["connections_closed"] += 1
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self):
+        """Checks out a healthy connection, opening a new one if the pool has headroom."""
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout if self.checkout_timeout else None
+        waited = False
+
+        while True:
+            conn = None
+            open_new = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeout("Connection pool is closed")
+                    if self._idle:
+                        conn, _ = self._idle.pop()
+                        break
+                    if len(self._in_use) + self._opening < self.max_size:
+                        self._opening += 1
+                        open_new = True
+                        break
+                    waited = True
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No database connection available after {self.checkout_timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+
+            if open_new:
+                try:
+                    conn = self._connect()
+                finally:
+                    with self._cond:
+                        self._opening -= 1
+                        if conn is None:
+                            self._cond.notify()
+            elif not self._is_healthy(conn):
+                with self._cond:
+                    self._stats["health_check_failures"] += 1
+                self._discard(conn)
+                continue
+
+            wait_ms = (time.monotonic() - start) * 1000
+            with self._cond:
+                self._in_use.add(conn)
+                self._stats["checkouts"] += 1
+                if waited:
+                    self._stats["waits"] += 1
+                self._stats["total_wait_ms"] += wait_ms
+                self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+            return conn
+
+    def putconn(self, conn, discard=False):
+        """Returns a connection to the pool, resetting any open transaction."""
+        if not discard and not conn.closed:
+            try:
+                conn.rollback()
+                conn.autocommit = False
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use.discard(conn)
+            keep = not discard and not conn.closed and not self._closed
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        if not keep:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """Checks out a connection for the duration of a block; commits on success, rolls back on error."""
+        conn = self.getconn()
+        try:
+            yield conn
+            if not conn.autocommit:
+                conn.commit()
+        except (psycopg2.InterfaceError, psycopg2.OperationalError):
+            # Broken connection: never hand it to another caller
+            self.putconn(conn, discard=True)
+            raise
+        except BaseException:
+            self.putconn(conn)
+            raise
+        else:
+            self.putconn(conn)
+
+    def reap(self):
+        """Closes connections idle longer than `idle_timeout`, keeping at least `min_size` open."""
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            total = len(self._idle) + len(self._in_use)
+            # Oldest idle connections sit on the left of the deque
+            while self._idle and total > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+                conn, _ = self._idle.popleft()
+                expired.append(conn)
+                total -= 1
+            self._stats["reaped"] += len(expired)
+        for conn in expired:
+            self._discard(conn)
+        return len(expired)
+
+    def _reap_loop(self, interval):
+        while not self._stop.wait(interval):
+            self.reap()
+
+    def stats(self):
+        with self._cond:
+            checkouts = self._stats["checkouts"]
+            in_use = len(self._in_use)
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": in_use + len(self._idle),
+                "in_use": in_use,
+                "idle": len(self._idle),
+                "saturation": round(in_use / self.max_size, 3),
+                "avg_wait_ms": round(self._stats["total_wait_ms"] / checkouts, 3) if checkouts else 0.0,
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in self._stats.items()},
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        self._stop.set()
+        for conn in idle:
+            self._discard(conn)
@@ -56,7 +56,128 @@ CREATE TABLE IF NOT EXISTS agent_decisions (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
--- Indices for performance
+-- Change notification per write statement; drives MCP result-cache invalidation.
+-- NOTIFY only: there is no shared row for concurrent writers to queue on, and the
+-- notification is delivered at commit. (Postgres still serialises the brief
+-- enqueue step of notifying commits, but no lock is held for the transaction.)
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('mcp_table_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['users', 'customers', 'deals', 'activities', 'policies'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_version ON %1$I', t);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%1$s_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %1$I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()', t);
+    END LOOP;
+END;
+$$;
+
+-- Per-stage deal counts and value by owner, kept current by statement-level
+-- triggers on deals so the pipeline summary reads O(stages x owners) rows
+-- instead of scanning deals. owner_id 0 = unassigned.
+CREATE TABLE IF NOT EXISTS deal_pipeline_agg (
+    stage TEXT NOT NULL,
+    owner_id INT NOT NULL DEFAULT 0,
+    deal_count BIGINT NOT NULL DEFAULT 0,
+    total_value NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (stage, owner_id)
+);
+
+CREATE OR REPLACE FUNCTION apply_deal_pipeline_delta() RETURNS trigger AS $$
+DECLARE
+    changed BIGINT;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM deal_pipeline_agg;
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO deal_pipeline_agg AS a (stage, owner_id, deal_count, total_value)
+        SELECT stage, COALESCE(owner_id, 0), COUNT(*), SUM(deal_value) FROM new_rows GROUP BY 1, 2
+        ON CONFLICT (stage, owner_id) DO UPDATE
+        SET deal_count = a.deal_count + EXCLUDED.deal_count, total_value = a.total_value + EXCLUDED.total_value;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO deal_pipeline_agg AS a (stage, owner_id, deal_count, total_value)
+        SELECT stage, COALESCE(owner_id, 0), -COUNT(*), -SUM(deal_value) FROM old_rows GROUP BY 1, 2
+        ON CONFLICT (stage, owner_id) DO UPDATE
+        SET deal_count = a.deal_count + EXCLUDED.deal_count, total_value = a.total_value + EXCLUDED.total_value;
+        -- Only keys the statement touched can have dropped to zero (PK lookups, not a full scan)
+        DELETE FROM deal_pipeline_agg a
+        USING (SELECT stage, COALESCE(owner_id, 0) AS owner_id FROM old_rows GROUP BY 1, 2) d
+        WHERE a.stage = d.stage AND a.owner_id = d.owner_id AND a.deal_count = 0;
+    ELSE
+        -- Net change per (stage, owner): updates that leave stage, owner and value
+        -- alone (e.g. last_activity) cancel out and never touch the aggregate rows
+        INSERT INTO deal_pipeline_agg AS a (stage, owner_id, deal_count, total_value)
+        SELECT stage, owner_id, SUM(n), SUM(v)
+        FROM (
+            SELECT stage, COALESCE(owner_id, 0) AS owner_id, 1 AS n, deal_value AS v FROM new_rows
+            UNION ALL
+            SELECT stage, COALESCE(owner_id, 0), -1, -deal_value FROM old_rows
+        ) d
+        GROUP BY 1, 2
+        HAVING SUM(n) <> 0 OR SUM(v) <> 0
+        ON CONFLICT (stage, owner_id) DO UPDATE
+        SET deal_count = a.deal_count + EXCLUDED.deal_count, total_value = a.total_value + EXCLUDED.total_value;
+        GET DIAGNOSTICS changed = ROW_COUNT;
+        IF changed > 0 THEN
+            DELETE FROM deal_pipeline_agg a
+            USING (SELECT stage, COALESCE(owner_id, 0) AS owner_id FROM old_rows GROUP BY 1, 2) d
+            WHERE a.stage = d.stage AND a.owner_id = d.owner_id AND a.deal_count = 0;
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables allow only one event per trigger, hence one trigger per operation
+DROP TRIGGER IF EXISTS trg_deals_pipeline_ins ON deals;
+CREATE TRIGGER trg_deals_pipeline_ins AFTER INSERT ON deals
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_deal_pipeline_delta();
+DROP TRIGGER IF EXISTS trg_deals_pipeline_upd ON deals;
+CREATE TRIGGER trg_deals_pipeline_upd AFTER UPDATE ON deals
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_deal_pipeline_delta();
+DROP TRIGGER IF EXISTS trg_deals_pipeline_del ON deals;
+CREATE TRIGGER trg_deals_pipeline_del AFTER DELETE ON deals
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_deal_pipeline_delta();
+DROP TRIGGER IF EXISTS trg_deals_pipeline_trunc ON deals;
+CREATE TRIGGER trg_deals_pipeline_trunc AFTER TRUNCATE ON deals
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_deal_pipeline_delta();
+
+-- Full recompute; blocks deal writes while it runs
+CREATE OR REPLACE FUNCTION rebuild_deal_pipeline_agg() RETURNS void AS $$
+BEGIN
+    LOCK TABLE deals IN SHARE MODE;
+    DELETE FROM deal_pipeline_agg;
+    INSERT INTO deal_pipeline_agg (stage, owner_id, deal_count, total_value)
+    SELECT stage, COALESCE(owner_id, 0), COUNT(*), SUM(deal_value) FROM deals GROUP BY 1, 2;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill once for databases that had deals before the aggregate existed
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM deal_pipeline_agg) AND EXISTS (SELECT 1 FROM deals) THEN
+        PERFORM rebuild_deal_pipeline_agg();
+    END IF;
+END;
+$$;
+
+-- Indices for performance (access-pattern indexes live in database/migrations)
 CREATE INDEX IF NOT EXISTS idx_deals_owner ON deals(owner_id);
 CREATE INDEX IF NOT EXISTS idx_deals_customer ON deals(customer_id);
-CREATE INDEX IF NOT EXISTS idx_activities_deal ON activities(deal_id);
+
+-- Versioned migrations applied on top of this baseline
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version TEXT PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT NOW()
+);
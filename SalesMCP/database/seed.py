@@ -1,71 +1,330 @@
-from datetime import date, timedelta
+"""
+Seed data for SalesMCP.
+
+run_seed() loads the small demo fixture the agent examples refer to, then a
+synthetic dataset on top when database.seed.synthetic in config.yaml asks
+for one. generate() is the bulk loader behind it: users, customers, deals,
+activities and policies are streamed through COPY inside a single
+transaction, from a deterministic RNG, with progress and rows/sec.
+
+Usage (from the SalesMCP directory; needs the Postgres from config.yaml):
+    python -m database.seed --users 2000 --customers 200000 --deals 2000000 --activities 10000000
+"""
+import argparse
+import csv
+import io
+import os
 import random
+import time
+from datetime import date, timedelta
+
+from psycopg2.extras import execute_values
+
+TABLES = ("users", "customers", "deals", "activities", "policies")
+COLUMNS = {
+    "users": ("id", "name", "role", "region"),
+    "customers": ("id", "name", "industry", "risk_score", "region"),
+    "deals": ("id", "customer_id", "owner_id", "deal_value", "stage", "probability", "expected_close_date",
+              "last_activity"),
+    "activities": ("id", "deal_id", "activity_type", "activity_date", "notes"),
+    "policies": ("id", "policy_name", "rule"),
+}
+
+FIRST_NAMES = ["Alice", "Bob", "Charlie", "Dana", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jamal",
+               "Kavya", "Liam", "Maria", "Noah", "Olga", "Priya", "Quinn", "Rafael", "Sofia", "Tomas"]
+LAST_NAMES = ["Johnson", "Smith", "Davis", "Garcia", "Nguyen", "Khan", "Muller", "Rossi", "Tanaka", "Silva",
+              "Okafor", "Kowalski", "Dubois", "Patel", "Novak", "Larsen", "Costa", "Ivanova", "Reyes", "Brown"]
+ROLES = [("Account Executive", 0.6), ("Senior Sales Rep", 0.3), ("Sales Manager", 0.1)]
+REGIONS = ["North America", "EMEA", "APAC", "LATAM"]
+INDUSTRIES = ["Software", "Transportation", "Energy", "Construction", "Healthcare", "Retail", "Finance",
+              "Manufacturing", "Telecom", "Education"]
+COMPANY_WORDS = ["Global", "Star", "Eco", "Tech", "Blue", "Summit", "North", "Prime", "Apex", "Urban"]
+COMPANY_NOUNS = ["Logistics", "Systems", "Energy", "Build", "Health", "Labs", "Networks", "Foods", "Capital", "Works"]
+COMPANY_SUFFIXES = ["Inc", "Ltd", "GmbH", "Corp", "Group"]
+# Roughly a mature pipeline: most deals are closed
+STAGES = [("Closed Won", 0.35), ("Closed Lost", 0.30), ("Discovery", 0.10), ("Qualification", 0.08),
+          ("Proposal", 0.07), ("Negotiation", 0.05), ("Closing", 0.05)]
+STAGE_PROBABILITY = {"Closed Won": 1.0, "Closed Lost": 0.0, "Discovery": 0.1, "Qualification": 0.25,
+                     "Proposal": 0.5, "Negotiation": 0.65, "Closing": 0.85}
+ACTIVITY_NOTES = {
+    "Call": ["Discussed timeline with the buying committee.", "Left voicemail for the champion.",
+             "Client ready to sign pending final approval."],
+    "Email": ["Sent follow-up on the contract terms.", "Shared case studies from the same industry.",
+              "Client hasn't responded regarding the contract."],
+    "Meeting": ["Deep dive into technical requirements.", "Executive alignment session.",
+                "Security review with the client IT team."],
+    "Proposal": ["Sent updated pricing proposal.", "Revised scope after procurement feedback."],
+}
+POLICY_RULES = {
+    "Discount": "Deals over ${amount}k require Manager approval for discounts > {pct}%.",
+    "Follow-up": "Active deals must have a recorded activity within the last {days} days.",
+    "Risk": "Customers with risk_score > {risk} must be reviewed by Compliance.",
+    "Approval": "Deals over ${amount}k need Finance sign-off before Closing.",
+    "Renewal": "Renewals must be opened {days} days before contract end.",
+}
+
+# Bytes copy_expert() asks for per read (its default is 8 KB)
+COPY_READ_SIZE = 1 << 20
+
+# Share of open deals untouched for over a week (what get_stalled_deals reports)
+STALLED_SHARE = 0.05
+
+
+def _weighted(rng, options):
+    values, weights = zip(*options)
+    return rng.choices(values, weights)[0]
+
+
+def _users(rng, ids):
+    for i in ids:
+        yield (i, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", _weighted(rng, ROLES), rng.choice(REGIONS))
+
+
+def _customers(rng, ids):
+    for i in ids:
+        name = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_NOUNS)} {rng.choice(COMPANY_SUFFIXES)}"
+        yield (i, name, rng.choice(INDUSTRIES), round(rng.betavariate(2, 5), 3), rng.choice(REGIONS))
+
+
+def _deals(rng, ids, customer_ids, owner_ids):
+    today = date.today()
+    for i in ids:
+        stage = _weighted(rng, STAGES)
+        if stage.startswith("Closed"):
+            close = today - timedelta(days=rng.randint(0, 365))
+            last = close - timedelta(days=rng.randint(0, 14))
+            probability = STAGE_PROBABILITY[stage]
+        else:
+            close = today + timedelta(days=rng.randint(-15, 180))
+            stalled = rng.random() < STALLED_SHARE
+            last = today - timedelta(days=rng.randint(8, 60) if stalled else rng.randint(0, 6))
+            probability = round(min(0.99, max(0.01, STAGE_PROBABILITY[stage] + rng.uniform(-0.1, 0.1))), 2)
+        # Skewed towards lower ids: a few reps and customers carry much of the pipeline
+        owner = owner_ids[int(len(owner_ids) * rng.random() ** 1.5)]
+        customer = customer_ids[int(len(customer_ids) * rng.random() ** 1.2)]
+        value = round(min(5_000_000.0, rng.lognormvariate(10.5, 1.0)), 2)
+        yield (i, customer, owner, value, stage, probability, close, last)
+
+
+def _activities(rng, ids, deal_ids):
+    today = date.today()
+    types = list(ACTIVITY_NOTES)
+    for i in ids:
+        kind = rng.choice(types)
+        yield (i, rng.choice(deal_ids), kind, today - timedelta(days=int(rng.expovariate(1 / 20))),
+               rng.choice(ACTIVITY_NOTES[kind]))
+
+
+def _policies(rng, ids):
+    kinds = list(POLICY_RULES)
+    for i in ids:
+        kind = kinds[i % len(kinds)]
+        rule = POLICY_RULES[kind].format(amount=rng.choice([50, 100, 250]), pct=rng.choice([5, 7, 10]),
+                                         risk=rng.choice([0.6, 0.7, 0.8]),
+                                         days=rng.choice([7, 14, 30]))
+        yield (i, f"{kind} Policy {i}", rule)
+
+
+class _CopyStream:
+    """
+    File-like view over a row generator for cursor.copy_expert(): rows are
+    encoded as CSV in chunks as Postgres reads, so memory stays flat at any
+    scale. `on_rows(n)` is called after each chunk.
+    """
+
+    def __init__(self, rows, on_rows, chunk_rows=10_000):
+        self._rows = rows
+        self._on_rows = on_rows
+        self._chunk_rows = chunk_rows
+        self._buf = ""
+        # Read offset into _buf: reads slice from here instead of re-copying the remainder
+        self._pos = 0
+
+    def _fill(self):
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        n = 0
+        for row in self._rows:
+            writer.writerow(row)
+            n += 1
+            if n >= self._chunk_rows:
+                break
+        if n:
+            self._on_rows(n)
+        return out.getvalue()
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buf) - self._pos < size:
+            chunk = self._fill()
+            if not chunk:
+                break
+            # Only the unread tail (shorter than one read) is copied
+            self._buf = self._buf[self._pos:] + chunk
+            self._pos = 0
+        end = len(self._buf) if size < 0 else self._pos + size
+        data = self._buf[self._pos:end]
+        self._pos += len(data)
+        return data
+
+
+class _Progress:
+    def __init__(self, table, total, verbose):
+        self.table = table
+        self.total = total
+        self.verbose = verbose
+        self.done = 0
+        self.start = time.perf_counter()
+        self._printed = 0.0
+
+    @property
+    def rate(self):
+        return self.done / max(time.perf_counter() - self.start, 1e-9)
+
+    def __call__(self, n):
+        self.done += n
+        now = time.perf_counter()
+        if self.verbose and (now - self._printed > 0.5 or self.done >= self.total):
+            self._printed = now
+            print(f"\r  {self.table:<11} {self.done:>12,}/{self.total:,} ({self.rate:,.0f} rows/s)", end="", flush=True)
+
+
+def generate(db_manager, counts, seed=42, truncate=False, verbose=True, chunk_rows=10_000):
+    """
+    Appends synthetic rows, `counts` giving the number per table (missing
+    tables get none), in one transaction. Each table draws from its own RNG
+    derived from `seed`, so the same counts and seed give the same data.
+    Deals reference the users and customers created by this load (or, when
+    it creates none, those already present), and activities the deals. With `truncate`, the five tables are emptied first.
+    Returns {table: {"rows", "seconds", "rows_per_sec"}}.
+    """
+    counts = {t: int(counts.get(t) or 0) for t in TABLES}
+    stats = {}
+    with db_manager.connection() as conn, conn.cursor() as cur:
+        if truncate:
+            cur.execute("TRUNCATE activities, deals, customers, users, policies RESTART IDENTITY CASCADE")
+        # Ids are assigned here so deals and activities can reference rows of this same load
+        cur.execute(f"LOCK TABLE {', '.join(TABLES)} IN SHARE ROW EXCLUSIVE MODE")
+        ranges = {}
+        for table in TABLES:
+            cur.execute(f"SELECT COALESCE(MAX(id), 0) AS max_id FROM {table}")
+            base = cur.fetchone()["max_id"]
+            ranges[table] = range(base + 1, base + counts[table] + 1)
+
+        def referenced_ids(table, needed):
+            """Ids that foreign keys may point at: this load's rows, else those already in the table."""
+            if not needed:
+                return []
+            if counts[table]:
+                return ranges[table]
+            # Existing rows may have gaps (deletes, rolled-back inserts), so read the real ids
+            cur.execute(f"SELECT id FROM {table} ORDER BY id")
+            return [r["id"] for r in cur.fetchall()]
+
+        owner_ids = referenced_ids("users", counts["deals"])
+        customer_ids = referenced_ids("customers", counts["deals"])
+        deal_ids = referenced_ids("deals", counts["activities"])
+        if counts["deals"] and not (owner_ids and customer_ids):
+            raise ValueError("Deals need at least one user and one customer")
+        if counts["activities"] and not deal_ids:
+            raise ValueError("Activities need at least one deal")
+        rows = {
+            "users": lambda rng: _users(rng, ranges["users"]),
+            "customers": lambda rng: _customers(rng, ranges["customers"]),
+            "deals": lambda rng: _deals(rng, ranges["deals"], customer_ids, owner_ids),
+            "activities": lambda rng: _activities(rng, ranges["activities"], deal_ids),
+            "policies": lambda rng: _policies(rng, ranges["policies"]),
+        }
+
+        for table in TABLES:
+            if not counts[table]:
+                continue
+            rng = random.Random(f"{seed}:{table}")
+            progress = _Progress(table, counts[table], verbose)
+            stream = _CopyStream(rows[table](rng), progress, chunk_rows)
+            cur.copy_expert(f"COPY {table} ({', '.join(COLUMNS[table])}) FROM STDIN WITH (FORMAT csv)", stream,
+                            size=COPY_READ_SIZE)
+            cur.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), %s)", (ranges[table].stop - 1,))
+            seconds = time.perf_counter() - progress.start
+            stats[table] = {"rows": counts[table], "seconds": round(seconds, 3),
+                            "rows_per_sec": round(counts[table] / max(seconds, 1e-9))}
+            if verbose:
+                print()
+        commit_start = time.perf_counter()
+    if verbose and stats:
+        total = sum(s["rows"] for s in stats.values())
+        seconds = sum(s["seconds"] for s in stats.values()) + time.perf_counter() - commit_start
+        print(f"  {total:,} rows in {seconds:.1f}s ({total / max(seconds, 1e-9):,.0f} rows/s, incl. commit)")
+    return stats
+
 
 def run_seed(db_manager):
-    # Seed Users
-    users = [
-        ("Alice Johnson", "Senior Sales Rep", "North America"),
-        ("Bob Smith", "Account Executive", "EMEA"),
-        ("Charlie Davis", "Sales Manager", "APAC")
-    ]
-    for name, role, region in users:
-        db_manager.execute(
-            "INSERT INTO users (name, role, region) VALUES (%s, %s, %s) ON CONFLICT DO NOTHING",
-            (name, role, region)
-        )
-
-    # Seed Customers
-    customers = [
-        ("TechCorp Solution", "Software", 0.1, "North America"),
-        ("Global Logistics Inc", "Transportation", 0.8, "EMEA"), # Risky customer
-        ("Starlight Energy", "Energy", 0.3, "APAC"),
-        ("EcoBuild Ltd", "Construction", 0.2, "North America")
-    ]
-    for name, industry, risk, region in customers:
-        db_manager.execute(
-            "INSERT INTO customers (name, industry, risk_score, region) VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING",
-            (name, industry, risk, region)
-        )
-
-    # Get IDs for foreign keys
-    user_ids = [r['id'] for r in db_manager.query("SELECT id FROM users")]
-    customer_ids = [r['id'] for r in db_manager.query("SELECT id FROM customers")]
-
-    # Seed Deals
-    deals = [
-        (customer_ids[0], user_ids[0], 50000.0, "Closing", 0.9, date.today() + timedelta(days=5)),
-        (customer_ids[1], user_ids[1], 120000.0, "Negotiation", 0.4, date.today() + timedelta(days=45)), # Stalled deal
-        (customer_ids[2], user_ids[2], 75000.0, "Discovery", 0.2, date.today() + timedelta(days=90)),
-        (customer_ids[3], user_ids[0], 30000.0, "Proposal", 0.6, date.today() + timedelta(days=20))
-    ]
-    for cust_id, owner_id, val, stage, prob, close_date in deals:
-        db_manager.execute(
-            "INSERT INTO deals (customer_id, owner_id, deal_value, stage, probability, expected_close_date) VALUES (%s, %s, %s, %s, %s, %s)",
-            (cust_id, owner_id, val, stage, prob, close_date)
-        )
-
-    # Seed Activities
-    deal_ids = [r['id'] for r in db_manager.query("SELECT id FROM deals")]
-    activities = [
-        (deal_ids[0], "Call", "Client ready to sign pending final approval."),
-        (deal_ids[1], "Email", "Client hasn't responded in 10 days regarding the contract."),
-        (deal_ids[2], "Meeting", "Deep dive into technical requirements."),
-        (deal_ids[3], "Proposal", "Sent updated pricing proposal.")
-    ]
-    for deal_id, a_type, notes in activities:
-        db_manager.execute(
-            "INSERT INTO activities (deal_id, activity_type, notes) VALUES (%s, %s, %s)",
-            (deal_id, a_type, notes)
-        )
-
-    # Seed Policies
-    policies = [
-        ("Discount Policy", "Deals over $100k require Manager approval for discounts > 10%."),
-        ("Follow-up Policy", "Active deals must have a recorded activity within the last 7 days."),
-        ("Risk Policy", "Customers with risk_score > 0.7 must be reviewed by Compliance.")
-    ]
-    for name, rule in policies:
-        db_manager.execute(
-            "INSERT INTO policies (policy_name, rule) VALUES (%s, %s)",
-            (name, rule)
-        )
+    """Demo fixture plus the synthetic rows configured under database.seed.synthetic."""
+    today = date.today()
+    with db_manager.connection() as conn, conn.cursor() as cur:
+        user_ids = [r["id"] for r in execute_values(cur, "INSERT INTO users (name, role, region) VALUES %s RETURNING id", [
+            ("Alice Johnson", "Senior Sales Rep", "North America"),
+            ("Bob Smith", "Account Executive", "EMEA"),
+            ("Charlie Davis", "Sales Manager", "APAC")
+        ], fetch=True)]
+        customer_ids = [r["id"] for r in execute_values(
+            cur, "INSERT INTO customers (name, industry, risk_score, region) VALUES %s RETURNING id", [
+                ("TechCorp Solution", "Software", 0.1, "North America"),
+                ("Global Logistics Inc", "Transportation", 0.8, "EMEA"), # Risky customer
+                ("Starlight Energy", "Energy", 0.3, "APAC"),
+                ("EcoBuild Ltd", "Construction", 0.2, "North America")
+            ], fetch=True)]
+        deal_ids = [r["id"] for r in execute_values(
+            cur, "INSERT INTO deals (customer_id, owner_id, deal_value, stage, probability, expected_close_date) "
+                 "VALUES %s RETURNING id", [
+                (customer_ids[0], user_ids[0], 50000.0, "Closing", 0.9, today + timedelta(days=5)),
+                (customer_ids[1], user_ids[1], 120000.0, "Negotiation", 0.4, today + timedelta(days=45)), # Stalled deal
+                (customer_ids[2], user_ids[2], 75000.0, "Discovery", 0.2, today + timedelta(days=90)),
+                (customer_ids[3], user_ids[0], 30000.0, "Proposal", 0.6, today + timedelta(days=20))
+            ], fetch=True)]
+        execute_values(cur, "INSERT INTO activities (deal_id, activity_type, notes) VALUES %s", [
+            (deal_ids[0], "Call", "Client ready to sign pending final approval."),
+            (deal_ids[1], "Email", "Client hasn't responded in 10 days regarding the contract."),
+            (deal_ids[2], "Meeting", "Deep dive into technical requirements."),
+            (deal_ids[3], "Proposal", "Sent updated pricing proposal.")
+        ])
+        execute_values(cur, "INSERT INTO policies (policy_name, rule) VALUES %s", [
+            ("Discount Policy", "Deals over $100k require Manager approval for discounts > 10%."),
+            ("Follow-up Policy", "Active deals must have a recorded activity within the last 7 days."),
+            ("Risk Policy", "Customers with risk_score > 0.7 must be reviewed by Compliance.")
+        ])
+
+    seed_config = db_manager.config.get("seed") or {}
+    synthetic = seed_config.get("synthetic") or {}
+    if any(synthetic.values()):
+        generate(db_manager, synthetic, seed=seed_config.get("rng_seed", 42), verbose=False)
+
+
+def main():
+    from database.manager import DatabaseManager
+
+    config_path = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml")
+    if not os.path.exists(config_path):
+        config_path = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml.example")
+    schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
+
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic sales data")
+    parser.add_argument("--dbname", help="Target database (default: database.dbname from config.yaml)")
+    for table, default in (("users", 1_000), ("customers", 50_000), ("deals", 500_000),
+                           ("activities", 2_000_000), ("policies", 100)):
+        parser.add_argument(f"--{table}", type=int, default=default)
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed")
+    parser.add_argument("--truncate", action="store_true", help="Empty the tables first instead of appending")
+    args = parser.parse_args()
+
+    db = DatabaseManager(config_path, dbname=args.dbname)
+    db.setup_database(schema_path)
+    try:
+        generate(db, {t: getattr(args, t) for t in TABLES}, seed=args.seed, truncate=args.truncate)
+        for table in TABLES:
+            db.execute(f"ANALYZE {table}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import json
+import logging
+import select
+import threading
+import time
+from collections import OrderedDict
+
+NOTIFY_CHANNEL = "mcp_table_changed"
+
+logger = logging.getLogger(__name__)
+
+
+class TableVersionTracker:
+    """
+    Per-table write counters, kept in memory from change notifications.
+
+    Statement-level triggers NOTIFY on every write; a background thread
+    LISTENs on a dedicated connection and bumps the counter of the table
+    named in each notification. Notifications sent while the listener is
+    down are lost, so every (re)connect starts a new epoch that invalidates
+    everything cached before it, and snapshot() returns None while not
+    listening.
+    """
+
+    def __init__(self, db_manager, reconnect_interval=5.0, listen=True):
+        self.db = db_manager
+        self.reconnect_interval = reconnect_interval
+        self._versions = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._listening = False
+        self._stop = threading.Event()
+        self._thread = None
+        if listen:
+            self._thread = threading.Thread(target=self._listen_loop, name="mcp-cache-listener", daemon=True)
+            self._thread.start()
+
+    def snapshot(self, tables):
+        """Current versions of `tables` (plus the epoch), or None when changes cannot be observed."""
+        with self._lock:
+            if not self._listening:
+                return None
+            return {"_epoch": self._epoch, **{t: self._versions.get(t, 0) for t in tables}}
+
+    def _listen_loop(self):
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self.db.get_connection()
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                # Writes committed while nobody listened went unseen: start a new epoch
+                with self._lock:
+                    self._epoch += 1
+                    self._listening = True
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        with self._lock:
+                            for notify in conn.notifies:
+                                self._versions[notify.payload] = self._versions.get(notify.payload, 0) + 1
+                        conn.notifies.clear()
+            except Exception as e:
+                logger.error("Cache invalidation listener failed, serving uncached until it reconnects: %s", e)
+            finally:
+                with self._lock:
+                    self._listening = False
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            self._stop.wait(self.reconnect_interval)
+
+    def close(self):
+        self._stop.set()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of MCP tool results keyed by tool name + parameters.
+
+    Each entry remembers the versions of the tables it was computed from and
+    is served only while all of them are unchanged.
+    """
+
+    def __init__(self, db_manager, cache_config=None):
+        cfg = cache_config or {}
+        self.enabled = cfg.get('enabled', True)
+        self.max_entries = cfg.get('max_entries', 512)
+        self.max_age = cfg.get('max_age', 3600)
+        self.tracker = TableVersionTracker(
+            db_manager,
+            reconnect_interval=cfg.get('reconnect_interval', 5.0),
+            listen=self.enabled and cfg.get('listen', True),
+        )
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidated": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(tool_name, params):
+        return f"{tool_name}:{json.dumps(params, sort_keys=True, default=str)}"
+
+    def get_or_compute(self, tool_name, tables, params, compute):
+        """Returns (result, cache_status) where cache_status is 'hit', 'miss', 'bypass' or 'disabled'."""
+        if not self.enabled:
+            return compute(), "disabled"
+
+        key = self._key(tool_name, params)
+        versions = self.tracker.snapshot(tables)
+        if versions is None:
+            # Listener down: a write could go unnoticed, so don't serve or store entries
+            return compute(), "bypass"
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry["versions"] == versions and now - entry["stored_at"] < self.max_age:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry["result"], "hit"
+                del self._entries[key]
+                self.stats["invalidated"] += 1
+            self.stats["misses"] += 1
+
+        # Versions were read before the query, so a concurrent write can only make this entry stale early
+        result = compute()
+        with self._lock:
+            self._entries[key] = {"result": result, "versions": versions, "stored_at": now}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return result, "miss"
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                "invalidation": "listen" if self.tracker._listening else "bypass",
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        self.tracker.close()
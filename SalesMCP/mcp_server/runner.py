@@ -0,0 +1,28 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncToolRunner:
+    """
+    Runs the synchronous MCPTools capabilities on a bounded worker pool so the
+    event loop stays free while psycopg2 blocks on I/O.
+
+    The worker count should not exceed the DB pool's max_size; extra workers
+    would only queue on connection checkout.
+    """
+
+    def __init__(self, tools, max_workers=10):
+        self.tools = tools
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-tool")
+
+    async def run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def call(self, method_name, *args, **kwargs):
+        return await self.run(getattr(self.tools, method_name), *args, **kwargs)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -1,12 +1,44 @@
 import os
+import json
+import hashlib
+import asyncio
+import logging
 import yaml
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from mcp_server.tools import MCPTools
+from mcp_server.runner import AsyncToolRunner
+from mcp_server.result_cache import ResultCache
 from database.manager import DatabaseManager
+from observability.log import setup_logging
+from observability import metrics
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="SalesMCP Producer Server")
+metrics.install(app, "mcp_server")
+
+CAPABILITIES = [
+    "get_sales_pipeline_summary",
+    "get_deals_by_owner",
+    "get_customer_profile",
+    "get_stalled_deals",
+    "evaluate_deal_risk",
+    "prioritize_deals_for_today",
+    "check_sales_policy",
+    "log_agent_decision"
+]
+# Content hash of the tool set: changes only when CAPABILITIES does
+CAPABILITIES_VERSION = hashlib.sha256(json.dumps(CAPABILITIES).encode()).hexdigest()[:16]
+CAPABILITIES_ETAG = f'"{CAPABILITIES_VERSION}"'
+
+@app.middleware("http")
+async def capabilities_version_header(request: Request, call_next):
+    # Lets clients notice a changed tool set on any response, not just /capabilities
+    response = await call_next(request)
+    response.headers["X-MCP-Capabilities-Version"] = CAPABILITIES_VERSION
+    return response
 
 # Initialize DB and Tools
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml")
@@ -14,25 +46,46 @@ if not os.path.exists(CONFIG_PATH):
     # Fallback for demo/dev
     CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml.example")
 
+with open(CONFIG_PATH, 'r') as f:
+    full_config = yaml.safe_load(f)
+    server_config = full_config['mcp']
+
+setup_logging((full_config.get('logging') or {}).get('level'))
+
 db = DatabaseManager(CONFIG_PATH)
-mcp_tools = MCPTools(db)
+result_cache = ResultCache(db, server_config.get('result_cache'))
+mcp_tools = MCPTools(db, result_cache)
+# Blocking tool calls run on worker threads; default to one worker per pooled connection
+tool_runner = AsyncToolRunner(
+    mcp_tools,
+    max_workers=server_config.get('tool_workers') or db.pool_config.get('max_size', 10)
+)
 
 # Automated DB Setup on startup
 @app.on_event("startup")
 async def startup_event():
-    print("[DEBUG] MCP Server starting up...")
+    logger.info("MCP Server starting up...")
     schema_path = os.path.join(os.path.dirname(__file__), "..", "database", "schema.sql")
     seed_path = os.path.join(os.path.dirname(__file__), "..", "database", "seed.py")
     try:
-        db.setup_database(schema_path)
-        # Check if seeded
-        res = db.query("SELECT COUNT(*) FROM users")
-        if res[0]['count'] == 0:
-            print("[DEBUG] Database empty. Running seed scripts...")
-            db.seed_data(seed_path)
-        print("[DEBUG] Database initialization complete.")
+        await tool_runner.run(initialize_database, schema_path, seed_path)
+        logger.info("Database initialization complete.")
     except Exception as e:
-        print(f"[CRITICAL] Startup Database Error: {e}")
+        logger.critical("Startup Database Error: %s", e)
+
+def initialize_database(schema_path, seed_path):
+    db.setup_database(schema_path)
+    # Check if seeded
+    res = db.query("SELECT COUNT(*) FROM users")
+    if res[0]['count'] == 0:
+        logger.info("Database empty. Running seed scripts...")
+        db.seed_data(seed_path)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    tool_runner.shutdown()
+    result_cache.close()
+    db.close()
 
 class DecisionLog(BaseModel):
     agent_name: str
@@ -41,65 +94,120 @@ class DecisionLog(BaseModel):
     confidence: float
     evidence: Dict[str, Any]
 
+class DecisionLogBatch(BaseModel):
+    decisions: List[DecisionLog]
+
+class ToolInvocation(BaseModel):
+    tool_name: str
+    param: Optional[str] = None
+    id: Optional[int] = None
+
+class ToolBatch(BaseModel):
+    calls: List[ToolInvocation]
+
 @app.get("/capabilities")
-async def get_capabilities():
-    print("[DEBUG] Client requested capabilities list.")
+async def get_capabilities(request: Request, response: Response):
+    logger.debug("Client requested capabilities list.")
+    if request.headers.get("if-none-match") == CAPABILITIES_ETAG:
+        return Response(status_code=304, headers={"ETag": CAPABILITIES_ETAG})
+    response.headers["ETag"] = CAPABILITIES_ETAG
     return {
-        "capabilities": [
-            "get_sales_pipeline_summary",
-            "get_deals_by_owner",
-            "get_customer_profile",
-            "get_stalled_deals",
-            "evaluate_deal_risk",
-            "prioritize_deals_for_today",
-            "check_sales_policy",
-            "log_agent_decision"
-        ]
+        "capabilities": CAPABILITIES,
+        "version": CAPABILITIES_VERSION
     }
 
+@app.get("/pool/stats")
+async def get_pool_stats():
+    """Connection pool saturation: size, in-use count and checkout wait times."""
+    return db.pool_stats()
+
+def dispatch_tool(tool_name: str, param: Optional[str] = None, id: Optional[int] = None):
+    """Maps a tool name and its query parameters onto the matching MCPTools capability (blocking)."""
+    with metrics.span("tool", tool_name if tool_name in CAPABILITIES else "unknown"):
+        return _dispatch_tool(tool_name, param, id)
+
+def _dispatch_tool(tool_name, param, id):
+    if tool_name == "get_sales_pipeline_summary":
+        # Optional slices: id = owner, param = owner region
+        return mcp_tools.get_sales_pipeline_summary(owner_id=id, region=param)
+    elif tool_name == "get_deals_by_owner":
+        return mcp_tools.get_deals_by_owner(param)
+    elif tool_name == "get_customer_profile":
+        return mcp_tools.get_customer_profile(id)
+    elif tool_name == "get_stalled_deals":
+        return mcp_tools.get_stalled_deals()
+    elif tool_name == "evaluate_deal_risk":
+        return mcp_tools.evaluate_deal_risk(id)
+    elif tool_name == "prioritize_deals_for_today":
+        # Fallback if id is missing
+        target_id = id
+        if not target_id:
+            logger.debug("No owner_id provided for prioritization. Attempting name lookup...")
+            if param:
+                # Look up by name if possible?
+                pass
+        return mcp_tools.prioritize_deals_for_today(target_id)
+    elif tool_name == "check_sales_policy":
+        return mcp_tools.check_sales_policy(param)
+    else:
+        logger.debug("Tool not found: %s", tool_name)
+        raise HTTPException(status_code=404, detail="Tool not found")
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Result cache hit rate, entry count and invalidation mode."""
+    return result_cache.get_stats()
+
+@app.post("/tools/batch")
+async def call_tools_batch(batch: ToolBatch):
+    """Runs several tool invocations concurrently; results come back in request order with per-item errors."""
+    max_batch = server_config.get('max_batch_size', 50)
+    if len(batch.calls) > max_batch:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {len(batch.calls)} calls (max {max_batch})")
+    logger.debug("MCP Batch Call: %s", [c.tool_name for c in batch.calls])
+
+    async def run_one(call: ToolInvocation):
+        try:
+            result = await tool_runner.run(dispatch_tool, call.tool_name, call.param, call.id)
+            return {"tool_name": call.tool_name, "status": "ok", "result": result}
+        except HTTPException as e:
+            return {"tool_name": call.tool_name, "status": "error", "status_code": e.status_code, "error": e.detail}
+        except Exception as e:
+            logger.error("MCP Tool Exception: %s", e)
+            return {"tool_name": call.tool_name, "status": "error", "status_code": 500, "error": str(e)}
+
+    results = await asyncio.gather(*(run_one(c) for c in batch.calls))
+    return {"results": results}
+
 @app.get("/tools/{tool_name}")
 async def call_tool(tool_name: str, param: Optional[str] = None, id: Optional[int] = None):
-    print(f"[DEBUG] MCP Tool Call: {tool_name} | Params: param={param}, id={id}")
+    logger.debug("MCP Tool Call: %s | Params: param=%s, id=%s", tool_name, param, id)
     try:
-        if tool_name == "get_sales_pipeline_summary":
-            return mcp_tools.get_sales_pipeline_summary()
-        elif tool_name == "get_deals_by_owner":
-            return mcp_tools.get_deals_by_owner(param)
-        elif tool_name == "get_customer_profile":
-            return mcp_tools.get_customer_profile(id)
-        elif tool_name == "get_stalled_deals":
-            return mcp_tools.get_stalled_deals()
-        elif tool_name == "evaluate_deal_risk":
-            return mcp_tools.evaluate_deal_risk(id)
-        elif tool_name == "prioritize_deals_for_today":
-            # Fallback if id is missing
-            target_id = id
-            if not target_id:
-                print("[DEBUG] No owner_id provided for prioritization. Attempting name lookup...")
-                if param:
-                    # Look up by name if possible?
-                    pass
-            return mcp_tools.prioritize_deals_for_today(target_id)
-        elif tool_name == "check_sales_policy":
-            return mcp_tools.check_sales_policy(param)
-        else:
-            print(f"[DEBUG] Tool not found: {tool_name}")
-            raise HTTPException(status_code=404, detail="Tool not found")
+        return await tool_runner.run(dispatch_tool, tool_name, param, id)
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"[ERROR] MCP Tool Exception: {str(e)}")
+        logger.error("MCP Tool Exception: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/log")
 async def log_decision(decision: DecisionLog):
-    print(f"[DEBUG] Logging decision for agent: {decision.agent_name}")
+    logger.debug("Logging decision for agent: %s", decision.agent_name)
+    try:
+        return await tool_runner.call("log_agent_decision", decision.model_dump())
+    except Exception as e:
+        logger.error("Log Decision Failure: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/log/batch")
+async def log_decision_batch(batch: DecisionLogBatch):
+    logger.debug("Logging batch of %d decisions", len(batch.decisions))
     try:
-        return mcp_tools.log_agent_decision(decision.model_dump())
+        return await tool_runner.call("log_agent_decisions", [d.model_dump() for d in batch.decisions])
     except Exception as e:
-        print(f"[ERROR] Log Decision Failure: {str(e)}")
+        logger.error("Log Batch Failure: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
-    with open(CONFIG_PATH, 'r') as f:
-        config = yaml.safe_load(f)['mcp']
-    uvicorn.run(app, host=config['host'], port=config['port'])
+    uvicorn.run(app, host=server_config['host'], port=server_config['port'])
@@ -1,22 +1,53 @@
 import json
+import logging
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
 class MCPTools:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, result_cache=None):
         self.db = db_manager
+        self.result_cache = result_cache
 
-    def get_sales_pipeline_summary(self):
-        """Returns a high-level summary of the entire sales pipeline."""
-        sql = """
-            SELECT stage, COUNT(*) as count, SUM(deal_value) as total_value 
-            FROM deals 
-            GROUP BY stage
+    def _cached(self, tool_name, tables, params, compute):
+        """Serves a read capability through the result cache and records the outcome in its metadata."""
+        if self.result_cache is None:
+            result, status = compute(), "disabled"
+        else:
+            result, status = self.result_cache.get_or_compute(tool_name, tables, params, compute)
+        # Copy so the cached object itself is never mutated
+        return {**result, "metadata": {**result.get("metadata", {}), "cache": status}}
+
+    def get_sales_pipeline_summary(self, owner_id=None, region=None):
         """
-        results = self.db.query(sql)
-        return {
-            "summary": results,
-            "metadata": {"data_source": "deals", "timestamp": str(date.today())}
-        }
+        Returns a high-level summary of the sales pipeline, optionally for one
+        owner or one owner region. Reads the trigger-maintained
+        deal_pipeline_agg table (one row per stage and owner), not deals.
+        """
+        def compute():
+            sql = """
+                SELECT a.stage, SUM(a.deal_count)::bigint as count, SUM(a.total_value)::float8 as total_value
+                FROM deal_pipeline_agg a
+                LEFT JOIN users u ON u.id = a.owner_id
+                WHERE (%(owner_id)s::int IS NULL OR a.owner_id = %(owner_id)s)
+                  AND (%(region)s::text IS NULL OR u.region ILIKE %(region)s)
+                GROUP BY a.stage
+            """
+            results = self.db.query(sql, {"owner_id": owner_id, "region": region})
+            return {
+                "summary": results,
+                "metadata": {
+                    "data_source": "deal_pipeline_agg",
+                    "owner_id": owner_id,
+                    "region": region,
+                    "timestamp": str(date.today())
+                }
+            }
+        # Cache entries still follow the deals version: every deal write also updates the aggregate
+        return self._cached(
+            "get_sales_pipeline_summary", ["deals", "users"],
+            {"owner_id": owner_id, "region": region, "as_of": str(date.today())}, compute
+        )
 
     def get_deals_by_owner(self, owner_name):
         """Returns all deals owned by a specific sales representative."""
@@ -57,18 +88,21 @@ class MCPTools:
 
     def get_stalled_deals(self):
         """Identifies deals that haven't had activity in over 7 days."""
-        sql = """
-            SELECT d.id, c.name as customer_name, d.deal_value, d.last_activity
-            FROM deals d
-            JOIN customers c ON d.customer_id = c.id
-            WHERE d.last_activity < CURRENT_DATE - INTERVAL '7 days'
-            AND d.stage NOT IN ('Closed Won', 'Closed Lost')
-        """
-        results = self.db.query(sql)
-        return {
-            "stalled_deals": results,
-            "metadata": {"criteria": "no activity > 7 days"}
-        }
+        def compute():
+            sql = """
+                SELECT d.id, c.name as customer_name, d.deal_value, d.last_activity
+                FROM deals d
+                JOIN customers c ON d.customer_id = c.id
+                WHERE d.last_activity < CURRENT_DATE - INTERVAL '7 days'
+                AND d.stage NOT IN ('Closed Won', 'Closed Lost')
+            """
+            results = self.db.query(sql)
+            return {
+                "stalled_deals": results,
+                "metadata": {"criteria": "no activity > 7 days"}
+            }
+        # Keyed on today's date too: the 7-day window moves even without writes
+        return self._cached("get_stalled_deals", ["deals", "customers"], {"as_of": str(date.today())}, compute)
 
     def evaluate_deal_risk(self, deal_id):
         """Reasoning capability: Assesses if a deal is at risk based on customer health and probability."""
@@ -95,8 +129,13 @@ class MCPTools:
 
     def prioritize_deals_for_today(self, owner_id=None):
         """Reasoning capability: Suggests which deals to focus on based on value and closing date."""
-        print(f"[DEBUG] Capability: prioritize_deals_for_today | owner_id: {owner_id}")
-        
+        logger.debug("Capability: prioritize_deals_for_today | owner_id: %s", owner_id)
+        return self._cached(
+            "prioritize_deals_for_today", ["deals", "customers"], {"owner_id": owner_id},
+            lambda: self._prioritize_deals(owner_id)
+        )
+
+    def _prioritize_deals(self, owner_id):
         if owner_id:
             sql = """
                 SELECT d.id, c.name as customer_name, d.deal_value, d.expected_close_date
@@ -109,7 +148,7 @@ class MCPTools:
             results = self.db.query(sql, (owner_id,))
         else:
             # Resiliency: If no owner_id, show top company deals
-            print("[DEBUG] No owner_id provided, returning company-wide priorities.")
+            logger.debug("No owner_id provided, returning company-wide priorities.")
             sql = """
                 SELECT d.id, c.name as customer_name, d.deal_value, d.expected_close_date
                 FROM deals d
@@ -128,17 +167,19 @@ class MCPTools:
 
     def check_sales_policy(self, policy_name):
         """Policy capability: Returns the rule for a specific sales policy."""
-        print(f"[DEBUG] Capability: check_sales_policy | policy: {policy_name}")
-        result = self.db.query("SELECT rule FROM policies WHERE policy_name ILIKE %s", (f"%{policy_name}%",))
-        return {
-            "policy": policy_name,
-            "rule": result[0]['rule'] if result else "Policy not found",
-            "metadata": {"source": "policies_table"}
-        }
+        logger.debug("Capability: check_sales_policy | policy: %s", policy_name)
+        def compute():
+            result = self.db.query("SELECT rule FROM policies WHERE policy_name ILIKE %s", (f"%{policy_name}%",))
+            return {
+                "policy": policy_name,
+                "rule": result[0]['rule'] if result else "Policy not found",
+                "metadata": {"source": "policies_table"}
+            }
+        return self._cached("check_sales_policy", ["policies"], {"policy_name": policy_name}, compute)
 
     def log_agent_decision(self, data):
         """Write capability: Logs an agent's reasoning into the audit table."""
-        print(f"[DEBUG] Capability: log_agent_decision | agent: {data.get('agent_name')}")
+        logger.debug("Capability: log_agent_decision | agent: %s", data.get('agent_name'))
         sql = """
             INSERT INTO agent_decisions (agent_name, input_question, recommendation, confidence, evidence)
             VALUES (%s, %s, %s, %s, %s)
@@ -152,3 +193,23 @@ class MCPTools:
             json.dumps(data.get('evidence'))
         ))
         return {"status": "success", "decision_id": res[0]['id']}
+
+    def log_agent_decisions(self, batch):
+        """Write capability: Logs many agent decisions with one multi-row insert."""
+        logger.debug("Capability: log_agent_decisions | batch size: %d", len(batch))
+        if not batch:
+            return {"status": "success", "decision_ids": []}
+        sql = """
+            INSERT INTO agent_decisions (agent_name, input_question, recommendation, confidence, evidence)
+            VALUES %s
+            RETURNING id
+        """
+        rows = [(
+            data.get('agent_name'),
+            data.get('input_question'),
+            data.get('recommendation'),
+            data.get('confidence'),
+            json.dumps(data.get('evidence'))
+        ) for data in batch]
+        res = self.db.execute_values(sql, rows, fetch=True, page_size=max(len(rows), 1))
+        return {"status": "success", "decision_ids": [r['id'] for r in res]}
@@ -0,0 +1,31 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener = None
+
+
+def setup_logging(level=None):
+    """
+    Leveled logging for the services. Records go onto an in-memory queue and
+    a background thread writes them to stdout, so request handlers never
+    block on console I/O. Level: argument, then LOG_LEVEL, then INFO.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    level = str(level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    records = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(FORMAT))
+    _listener = logging.handlers.QueueListener(records, handler)
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(records)]
+    root.setLevel(level)
+    _listener.start()
+    # Drain whatever is still queued on exit
+    atexit.register(_listener.stop)
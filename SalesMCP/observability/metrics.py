@@ -0,0 +1,112 @@
+import asyncio
+import re
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator, TypeVar
+
+from fastapi import Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+
+# Sub-millisecond DB/cache work up to multi-second LLM calls
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+SPAN_SECONDS = Histogram(
+    "salesmcp_span_seconds",
+    "Duration of instrumented operations (LLM calls, MCP tool calls, DB queries)",
+    ["kind", "name", "status"],
+    buckets=BUCKETS,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "salesmcp_http_request_seconds",
+    "HTTP request duration by route",
+    ["service", "method", "route", "status"],
+    buckets=BUCKETS,
+)
+
+T = TypeVar("T")
+
+_VERB = re.compile(r"^\s*(\w+)")
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+(\w+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def statement_name(sql: str) -> str:
+    """Low-cardinality label for a SQL statement, e.g. 'SELECT deals'."""
+    verb = _VERB.match(sql)
+    table = _TABLE.search(sql)
+    return " ".join(x for x in ((verb.group(1).upper() if verb else "SQL"), table.group(1) if table else "") if x)
+
+
+@contextmanager
+def span(kind: str, name: str):
+    """Times the block into salesmcp_span_seconds{kind, name, status}."""
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except (GeneratorExit, asyncio.CancelledError):
+        # The caller went away (e.g. a client disconnect); not a failure of the operation
+        status = "cancelled"
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        SPAN_SECONDS.labels(kind, name, status).observe(time.perf_counter() - start)
+
+
+async def timed_astream(kind: str, name: str, chunks: AsyncIterable[T]) -> AsyncIterator[T]:
+    """
+    Passes the async stream `chunks` through, timing only the waits for the
+    next chunk: time the consumer spends between chunks is not counted.
+    Recorded once, when the stream ends, fails ("error") or is abandoned or
+    cancelled ("cancelled").
+    """
+    it = chunks.__aiter__()
+    elapsed = 0.0
+    status = "ok"
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = await it.__anext__()
+            except StopAsyncIteration:
+                break
+            except asyncio.CancelledError:
+                status = "cancelled"
+                raise
+            except BaseException:
+                status = "error"
+                raise
+            finally:
+                elapsed += time.perf_counter() - start
+            yield chunk
+    except GeneratorExit:
+        status = "cancelled"
+        raise
+    finally:
+        SPAN_SECONDS.labels(kind, name, status).observe(elapsed)
+
+
+def install(app, service: str):
+    """Adds per-route request timing and a Prometheus-format GET /metrics to a FastAPI app."""
+
+    @app.middleware("http")
+    async def time_requests(request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # Route template, not the raw path, keeps label cardinality bounded
+            route = request.scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                service, request.method, getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - start)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
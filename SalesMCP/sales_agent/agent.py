@@ -1,7 +1,8 @@
 import os
-import requests
+import asyncio
+import logging
 import yaml
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
@@ -9,13 +10,58 @@ load_dotenv()
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
+from sales_agent.mcp_client import MCPClient
+from sales_agent.audit import AuditLogger
+from sales_agent.response_cache import ResponseCache
+from observability.metrics import span, timed_astream
 
-class Intent(BaseModel):
-    """The intent of the user's question, mapped to an MCP tool."""
+logger = logging.getLogger(__name__)
+
+# Query arguments each MCP tool reads (see _dispatch_tool in mcp_server/server.py)
+TOOL_ARGUMENTS = {
+    "get_sales_pipeline_summary": ("id", "param"),
+    "get_deals_by_owner": ("param",),
+    "get_customer_profile": ("id",),
+    "get_stalled_deals": (),
+    "evaluate_deal_risk": ("id",),
+    "prioritize_deals_for_today": ("id",),
+    "check_sales_policy": ("param",),
+}
+
+
+def fanout_argument(tool_name: str, value: Any) -> Optional[str]:
+    """
+    The argument a fanned-out value goes to: "id" for integer ids when the
+    tool takes one, "param" for names and other strings. None when the tool
+    accepts neither kind of value.
+    """
+    accepted = TOOL_ARGUMENTS.get(tool_name, ("id", "param"))
+    is_id = (isinstance(value, int) and not isinstance(value, bool)) or (isinstance(value, str) and value.isdigit())
+    if is_id and "id" in accepted:
+        return "id"
+    if "param" in accepted and not isinstance(value, (dict, list)):
+        return "param"
+    return None
+
+class ToolCall(BaseModel):
+    """One MCP tool call within an intent plan."""
+    step_id: str = Field(description="Short unique id for this step, e.g. 's1'")
     tool_name: str = Field(description="The name of the MCP tool to call")
     parameters: Dict[str, Any] = Field(description="Dictionary of parameters for the tool call (param or id)")
+    depends_on: Optional[str] = Field(default=None, description="step_id whose result this step needs, if any")
+    for_each: Optional[str] = Field(
+        default=None,
+        description="With depends_on: 'list_field.key' to call this tool once per item of the dependency's "
+                    "result list, e.g. 'deals.id' passes each deal id as the id parameter and 'deals.owner_name' "
+                    "each name as param"
+    )
     explanation: str = Field(description="Why this tool is being called")
 
+class Intent(BaseModel):
+    """The intent of the user's question, as a small plan of MCP tool calls."""
+    calls: List[ToolCall] = Field(description="The MCP tool calls needed to answer the question (usually 1-3)")
+    explanation: str = Field(description="Why these tools answer the question")
+
 class SalesAgent:
     def __init__(self, config_path):
         with open(config_path, 'r') as f:
@@ -24,27 +70,40 @@ class SalesAgent:
             self.agent_config = full_config['agent']
         
         self.mcp_base_url = f"http://{self.mcp_config['host']}:{self.mcp_config['port']}"
-        self.llm = ChatGoogleGenerativeAI(
-            model=self.agent_config['model'],
-            temperature=self.agent_config['temperature']
-        )
+        self.mcp_client = MCPClient(self.mcp_base_url, self.agent_config.get('mcp_client'))
+        self.audit = AuditLogger(self.mcp_client, self.agent_config.get('audit'))
+        self.response_cache = ResponseCache(self.agent_config.get('response_cache'))
+        self.max_plan_steps = self.agent_config.get('max_plan_steps', 5)
+        self.max_fanout = self.agent_config.get('max_fanout', 10)
+        if self.agent_config.get('provider', 'google') == 'fake':
+            # Offline stand-in for benchmarks and demos without a Gemini key
+            from sales_agent.fake_llm import FakeChatModel
+            self.llm = FakeChatModel.from_config(self.agent_config.get('fake'))
+        else:
+            self.llm = ChatGoogleGenerativeAI(
+                model=self.agent_config['model'],
+                temperature=self.agent_config['temperature']
+            )
         # Modern structured output
         self.intent_analyzer = self.llm.with_structured_output(Intent)
 
-    def get_available_tools(self) -> List[str]:
+    async def get_available_tools(self) -> List[str]:
         try:
-            resp = requests.get(f"{self.mcp_base_url}/capabilities")
-            return resp.json()['capabilities']
+            return await self.mcp_client.get_capabilities()
         except Exception as e:
-            print(f"Error fetching capabilities: {e}")
+            logger.error("Error fetching capabilities: %s", e)
             return []
 
-    def translate_intent(self, question: str) -> Intent:
-        tools = self.get_available_tools()
+    async def translate_intent(self, question: str) -> Intent:
+        tools = await self.get_available_tools()
         
         prompt = ChatPromptTemplate.from_template("""
             You are a Sales Assistant Intent Translator.
-            Given a user question, decide which MCP tool from the list below is the best fit.
+            Given a user question, plan the MCP tool calls from the list below needed to answer it.
+            Use a single call when one tool is enough. For compound questions, add further calls;
+            when a call needs ids produced by an earlier call, set depends_on to that step and
+            for_each to the list field and key to iterate (e.g. get_deals_by_owner then
+            evaluate_deal_risk with for_each 'deals.id'). Use at most {max_steps} calls.
             
             Available Tools: {tools}
             
@@ -52,27 +111,139 @@ class SalesAgent:
         """)
         
         chain = prompt | self.intent_analyzer
-        return chain.invoke({"tools": ", ".join(tools), "question": question})
+        with span("llm", "intent"):
+            return await chain.ainvoke({"tools": ", ".join(tools), "question": question, "max_steps": self.max_plan_steps})
 
-    def execute_query(self, question: str) -> Dict[str, Any]:
-        # 1. Translate intent
-        intent = self.translate_intent(question)
-        tool_name = intent.tool_name
-        params = intent.parameters
-        
-        # 2. Call MCP tool
-        if tool_name == "log_agent_decision":
-             return {"error": "Direct logging not allowed via NL query"}
-             
-        mcp_url = f"{self.mcp_base_url}/tools/{tool_name}"
+    def _expand(self, call: ToolCall, dependency: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Turns a planned call into concrete parameter sets, one per item when it fans out."""
+        if not call.for_each or dependency is None:
+            return [call.parameters]
+        list_field, _, key = call.for_each.partition(".")
+        items = dependency.get(list_field) or []
+        values = [item.get(key or "id") for item in items if isinstance(item, dict)]
+        param_sets = []
+        for v in values:
+            arg = fanout_argument(call.tool_name, v) if v is not None else None
+            if arg is not None:
+                param_sets.append({**call.parameters, arg: int(v) if arg == "id" else str(v)})
+        if values and not param_sets:
+            raise ValueError(f"{call.tool_name} takes no argument matching the values of '{call.for_each}'")
+        return param_sets[:self.max_fanout]
+
+    async def _run_call(self, call: ToolCall, dependency: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        step = {"tool_name": call.tool_name, "parameters": call.parameters}
         try:
-            resp = requests.get(mcp_url, params=params)
-            resp.raise_for_status()
-            mcp_data = resp.json()
-        except Exception as e:
-            return {"error": f"MCP Tool Call Failed: {str(e)}", "mcp_call": tool_name}
-        
-        # 3. Generate final recommendation
+            param_sets = self._expand(call, dependency)
+        except ValueError as e:
+            step["error"] = str(e)
+            return step
+        if not call.for_each:
+            try:
+                with span("mcp_call", call.tool_name):
+                    step["result"] = await self.mcp_client.call_tool(call.tool_name, call.parameters)
+            except Exception as e:
+                step["error"] = f"MCP Tool Call Failed: {str(e)}"
+            return step
+
+        # Fan-out: one round trip, executed concurrently on the server
+        if param_sets:
+            try:
+                with span("mcp_call", f"{call.tool_name}[batch]"):
+                    results = await self.batch_call([{"tool_name": call.tool_name, "parameters": p} for p in param_sets])
+            except Exception as e:
+                step["error"] = f"MCP Tool Call Failed: {str(e)}"
+                return step
+        else:
+            results = []
+        step["results"] = [
+            {"parameters": p, **({"result": r["result"]} if r["status"] == "ok" else {"error": r["error"]})}
+            for p, r in zip(param_sets, results)
+        ]
+        return step
+
+    @staticmethod
+    def _step_output(step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        What a dependent step sees of `step`: a single call's result as is; for
+        a fan-out, its successful results under "results" plus every list
+        field of those results concatenated (so 'deals.id' still resolves).
+        None when nothing succeeded.
+        """
+        if "result" in step:
+            return step["result"]
+        ok = [r["result"] for r in step.get("results") or [] if isinstance(r.get("result"), dict)]
+        if not ok:
+            return None
+        merged: Dict[str, Any] = {}
+        for result in ok:
+            for k, v in result.items():
+                if isinstance(v, list):
+                    merged.setdefault(k, []).extend(v)
+        merged["results"] = ok
+        return merged
+
+    @staticmethod
+    def _has_errors(mcp_data: Dict[str, Any]) -> bool:
+        """True when any plan step, or any item of a fan-out step, failed."""
+        return any(
+            "error" in step or any("error" in r for r in step.get("results") or [])
+            for step in mcp_data.values()
+        )
+
+    async def execute_plan(self, intent: Intent) -> Dict[str, Any]:
+        """
+        Runs the planned calls as a dataflow: every call starts as soon as the
+        step it depends on has finished, so independent calls run in parallel.
+        Returns evidence keyed by step_id.
+        """
+        calls = {}
+        evidence: Dict[str, Any] = {}
+        for i, call in enumerate(intent.calls[:self.max_plan_steps]):
+            # Direct logging not allowed via NL query
+            if call.tool_name == "log_agent_decision":
+                continue
+            if call.step_id in calls:
+                # Keep the first step under the id; dependents could not tell the two apart
+                evidence[f"{call.step_id}#{i}"] = {"tool_name": call.tool_name,
+                                                   "error": f"Duplicate step_id '{call.step_id}'"}
+                continue
+            calls[call.step_id] = call
+
+        def resolvable(step_id, seen=()):
+            call = calls.get(step_id)
+            if call is None or step_id in seen:
+                return False
+            return not call.depends_on or resolvable(call.depends_on, seen + (step_id,))
+
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run(call: ToolCall):
+            dependency = None
+            if call.depends_on:
+                try:
+                    upstream = await tasks[call.depends_on]
+                except Exception:
+                    upstream = {}
+                dependency = self._step_output(upstream)
+                if dependency is None:
+                    return {"tool_name": call.tool_name, "error": f"Dependency '{call.depends_on}' failed"}
+            return await self._run_call(call, dependency)
+
+        for step_id, call in calls.items():
+            if resolvable(step_id):
+                tasks[step_id] = asyncio.ensure_future(run(call))
+            else:
+                evidence[step_id] = {"tool_name": call.tool_name, "error": f"Unresolvable dependency '{call.depends_on}'"}
+
+        if tasks:
+            # One step blowing up must not discard the evidence every other step gathered
+            for step_id, step in zip(tasks, await asyncio.gather(*tasks.values(), return_exceptions=True)):
+                if isinstance(step, Exception):
+                    step = {"tool_name": calls[step_id].tool_name, "error": f"MCP Tool Call Failed: {step}"}
+                evidence[step_id] = step
+        return evidence
+
+    def _recommendation_messages(self, question: str, mcp_data: Any, explanation: str):
         prompt = ChatPromptTemplate.from_template("""
             You are a Senior Sales Operations Advisor.
             
@@ -90,15 +261,14 @@ class SalesAgent:
             Format as Markdown.
         """)
         
-        messages = prompt.format_messages(
+        return prompt.format_messages(
             question=question,
             mcp_data=str(mcp_data),
-            explanation=intent.explanation
+            explanation=explanation
         )
-        
-        recommendation_text = self.llm.invoke(messages).content
-        
-        # 4. Log the decision back to MCP
+
+    async def _finish(self, question: str, intent: Intent, mcp_data: Dict[str, Any], recommendation_text: str) -> Dict[str, Any]:
+        # Log the decision back to MCP (queued; written in batches off the request path)
         decision_data = {
             "agent_name": "SalesGPT-MCP",
             "input_question": question,
@@ -107,12 +277,94 @@ class SalesAgent:
             "evidence": mcp_data
         }
         try:
-            requests.post(f"{self.mcp_base_url}/log", json=decision_data)
+            await self.audit.log(decision_data)
         except:
             pass # Don't fail if audit logging fails
         
-        return {
+        tool_names = [c.tool_name for c in intent.calls]
+        result = {
             "recommendation": recommendation_text,
-            "mcp_call": tool_name,
+            "mcp_call": " + ".join(dict.fromkeys(tool_names)),
             "evidence": mcp_data
         }
+        # A partial answer (some step or fan-out item failed) may be a transient MCP error; don't replay it
+        if not self._has_errors(mcp_data):
+            self.response_cache.put(question, tool_names, {**result, "intent": intent.model_dump()})
+        return result
+
+    async def execute_query(self, question: str) -> Dict[str, Any]:
+        # 0. Repeated questions are answered from cache without any LLM or MCP calls
+        cached = self.response_cache.get(question)
+        if cached is not None:
+            return cached
+
+        # 1. Translate intent into a plan of tool calls
+        intent = await self.translate_intent(question)
+        if not intent.calls or all(c.tool_name == "log_agent_decision" for c in intent.calls):
+             return {"error": "Direct logging not allowed via NL query"}
+        
+        # 2. Call MCP tools, in parallel where the plan allows
+        mcp_data = await self.execute_plan(intent)
+        if all("error" in step for step in mcp_data.values()):
+            return {"error": "MCP Tool Call Failed", "mcp_call": " + ".join(c.tool_name for c in intent.calls), "evidence": mcp_data}
+        
+        # 3. Generate one recommendation over all the evidence
+        messages = self._recommendation_messages(question, mcp_data, intent.explanation)
+        with span("llm", "recommendation"):
+            recommendation_text = (await self.llm.ainvoke(messages)).content
+        
+        # 4. Audit + cache
+        return await self._finish(question, intent, mcp_data, recommendation_text)
+
+    async def stream_query(self, question: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Same pipeline as execute_query, yielded as (event, data) pairs: 'plan' and
+        'evidence' as soon as the MCP calls return, a 'token' per recommendation
+        chunk while the LLM generates, then 'done' with the full result.
+        """
+        cached = self.response_cache.get(question)
+        if cached is not None:
+            yield "evidence", {"mcp_call": cached.get("mcp_call"), "evidence": cached.get("evidence")}
+            yield "token", {"text": cached.get("recommendation", "")}
+            yield "done", cached
+            return
+
+        intent = await self.translate_intent(question)
+        if not intent.calls or all(c.tool_name == "log_agent_decision" for c in intent.calls):
+            yield "error", {"error": "Direct logging not allowed via NL query"}
+            return
+        yield "plan", intent.model_dump()
+
+        mcp_data = await self.execute_plan(intent)
+        mcp_call = " + ".join(dict.fromkeys(c.tool_name for c in intent.calls))
+        if all("error" in step for step in mcp_data.values()):
+            yield "error", {"error": "MCP Tool Call Failed", "mcp_call": mcp_call, "evidence": mcp_data}
+            return
+        yield "evidence", {"mcp_call": mcp_call, "evidence": mcp_data}
+
+        chunks = []
+        stream = self.llm.astream(self._recommendation_messages(question, mcp_data, intent.explanation))
+        # Times the provider only, not the SSE writes between chunks
+        async for chunk in timed_astream("llm", "recommendation_stream", stream):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield "token", {"text": chunk.content}
+
+        yield "done", await self._finish(question, intent, mcp_data, "".join(chunks))
+
+    async def batch_call(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Calls several MCP tools in one request, e.g.
+        [{"tool_name": "get_customer_profile", "parameters": {"id": 3}}, ...].
+        Returns one {"tool_name", "status", "result" | "error"} item per call, in order.
+        """
+        invocations = []
+        for call in calls:
+            params = call.get("parameters") or {}
+            invocations.append({"tool_name": call["tool_name"], "param": params.get("param"), "id": params.get("id")})
+        return await self.mcp_client.call_tools(invocations)
+
+    async def aclose(self):
+        # Flush pending audit records before the HTTP pool goes away
+        await self.audit.aclose()
+        await self.mcp_client.aclose()
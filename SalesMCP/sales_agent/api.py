@@ -1,13 +1,19 @@
 import os
+import json
+import yaml
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sales_agent.agent import SalesAgent
 from database.manager import DatabaseManager
+from observability.log import setup_logging
+from observability import metrics
 
 app = FastAPI(title="SalesMCP Consumer API")
+metrics.install(app, "consumer_api")
 
 # Mount static files
 static_path = os.path.join(os.path.dirname(__file__), "..", "static")
@@ -28,6 +34,9 @@ CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "config.ya
 if not os.path.exists(CONFIG_PATH):
     CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml.example")
 
+with open(CONFIG_PATH, 'r') as f:
+    setup_logging((yaml.safe_load(f).get('logging') or {}).get('level'))
+
 agent = SalesAgent(CONFIG_PATH)
 db = DatabaseManager(CONFIG_PATH)
 
@@ -37,14 +46,39 @@ class QueryRequest(BaseModel):
 @app.post("/ask")
 async def ask_question(request: QueryRequest):
     try:
-        return agent.execute_query(request.question)
+        return await agent.execute_query(request.question)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/ask/stream")
+async def ask_question_stream(request: QueryRequest):
+    """Server-Sent Events: plan and MCP evidence first, then recommendation tokens as they are generated."""
+    async def events():
+        try:
+            async for event, data in agent.stream_query(request.question):
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await agent.aclose()
+    db.close()
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return agent.response_cache.get_stats()
+
 @app.get("/history")
 async def get_history():
     try:
-        results = db.query("SELECT * FROM agent_decisions ORDER BY created_at DESC LIMIT 10")
+        results = await run_in_threadpool(db.query, "SELECT * FROM agent_decisions ORDER BY created_at DESC LIMIT 10")
         return {"history": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogger:
+    """
+    Fire-and-forget audit pipeline for agent decisions.
+
+    Decisions are queued in-process and a background task ships them to the
+    MCP server's /log/batch endpoint once `batch_size` entries are waiting or
+    `flush_interval` seconds have passed. The queue is bounded; when it is full
+    the `overflow` policy either drops the oldest entry, drops the new one, or
+    makes the caller wait. `aclose()` drains everything still queued.
+    """
+
+    def __init__(self, mcp_client, audit_config: Optional[Dict[str, Any]] = None):
+        cfg = audit_config or {}
+        self.mcp_client = mcp_client
+        self.batch_size = cfg.get('batch_size', 50)
+        self.flush_interval = cfg.get('flush_interval', 1.0)
+        self.max_queue = cfg.get('max_queue', 1000)
+        self.overflow = cfg.get('overflow', 'drop_oldest')
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy '{self.overflow}', expected one of {OVERFLOW_POLICIES}")
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._closing = False
+        self.stats = {"enqueued": 0, "dropped": 0, "flushed": 0, "batches": 0, "failed": 0}
+
+    def _ensure_worker(self):
+        # Created lazily so the queue and task bind to the server's running loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def log(self, decision: Dict[str, Any]):
+        """Queues a decision for background delivery; returns without waiting for the write."""
+        if self._closing:
+            self.stats["dropped"] += 1
+            return
+        self._ensure_worker()
+
+        if self._queue.full():
+            if self.overflow == "drop_newest":
+                self.stats["dropped"] += 1
+                return
+            if self.overflow == "drop_oldest":
+                self._queue.get_nowait()
+                self.stats["dropped"] += 1
+        # "block" (or room freed above): waits only when the queue is still full
+        await self._queue.put(decision)
+        self.stats["enqueued"] += 1
+
+    async def _next_batch(self):
+        """Collects up to batch_size decisions or whatever arrives within flush_interval."""
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = asyncio.get_running_loop().time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _send(self, batch: List[Dict[str, Any]]):
+        try:
+            await self.mcp_client.log_decisions(batch)
+            self.stats["flushed"] += len(batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            # Audit failures must never surface to the user-facing request
+            self.stats["failed"] += len(batch)
+            logger.warning("Audit batch of %d decisions failed: %s", len(batch), e)
+
+    async def _run(self):
+        while True:
+            batch, stop = await self._next_batch()
+            if batch:
+                await self._send(batch)
+            if stop:
+                return
+
+    async def flush(self):
+        """Sends everything currently queued, bypassing the size/time thresholds."""
+        if self._queue is None:
+            return
+        while not self._queue.empty():
+            batch = []
+            while not self._queue.empty() and len(batch) < self.batch_size:
+                item = self._queue.get_nowait()
+                if item is not _STOP:
+                    batch.append(item)
+            if batch:
+                await self._send(batch)
+
+    async def aclose(self):
+        """Stops accepting decisions and waits until the queued ones are delivered."""
+        self._closing = True
+        if self._worker is not None and not self._worker.done():
+            # The worker drains everything ahead of the sentinel before exiting
+            await self._queue.put(_STOP)
+            await self._worker
+        await self.flush()
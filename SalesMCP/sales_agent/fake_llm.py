@@ -0,0 +1,137 @@
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import PrivateAttr
+
+# Keyword -> MCP tool used by the built-in intent planner
+INTENT_RULES = [
+    ("stalled", "get_stalled_deals", {}),
+    ("priorit", "prioritize_deals_for_today", {}),
+    ("policy", "check_sales_policy", {"param": "discount"}),
+    ("risk", "evaluate_deal_risk", {"id": 1}),
+    ("customer", "get_customer_profile", {"id": 1}),
+    ("owner", "get_deals_by_owner", {"param": "Alice"}),
+    ("pipeline", "get_sales_pipeline_summary", {}),
+]
+
+
+def parse_latency(spec):
+    """Latency sampler (seconds): fixed:0.2 | uniform:0.1,0.5 | normal:0.3,0.05 | lognormal:0.3,0.5"""
+    kind, _, args = (spec or "fixed:0").partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] or [0.0]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        mu = math.log(values[0]) if values[0] > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for the Gemini model (agent.provider: fake).
+
+    Intent prompts get a tool plan picked by keyword from the question,
+    recommendation prompts a canned Markdown answer; `script` rules
+    ({"match": substring, "response": text}) take precedence. Each call waits
+    for a latency drawn from the configured distribution, with a seeded RNG.
+    """
+
+    script: List[Dict[str, str]] = []
+    latency: str = "fixed:0"
+    seed: int = 0
+
+    _rng: random.Random = PrivateAttr()
+    _sample: Callable = PrivateAttr()
+    _lock: Any = PrivateAttr()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._sample = parse_latency(self.latency)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, fake_config=None):
+        cfg = fake_config or {}
+        script = cfg.get('script') or []
+        if isinstance(script, str):
+            with open(script) as f:
+                script = json.load(f)
+        return cls(script=script, latency=cfg.get('latency', 'fixed:0'), seed=cfg.get('seed', 0))
+
+    @property
+    def _llm_type(self) -> str:
+        return "salesmcp-fake"
+
+    def with_structured_output(self, schema, **kwargs):
+        # Replies to intent prompts are JSON, so parsing is all that's needed
+        return self | RunnableLambda(lambda message: schema.model_validate_json(message.content))
+
+    def _reply(self, text):
+        for rule in self.script:
+            if rule.get('match', '') in text:
+                return rule['response']
+        match = re.search(r"User Question:\s*(.*)", text)
+        question = (match.group(1) if match else text).strip().lower()
+        if "Intent Translator" in text:
+            calls = [
+                {"step_id": f"s{i + 1}", "tool_name": tool, "parameters": params, "explanation": f"Question mentions '{kw}'"}
+                for i, (kw, tool, params) in enumerate(r for r in INTENT_RULES if r[0] in question)
+            ] or [{"step_id": "s1", "tool_name": "get_sales_pipeline_summary", "parameters": {}, "explanation": "Default overview"}]
+            return json.dumps({"calls": calls[:3], "explanation": "Keyword match (fake LLM)"})
+        return (
+            "## Recommendation\nFocus on the highest-value open deals first.\n\n"
+            "**Confidence Score:** 0.8\n\n## Detailed Explanation\nGenerated offline by the fake LLM provider.\n\n"
+            "## Evidence Summary\n- MCP data as returned by the tools"
+        )
+
+    def _prepare(self, messages):
+        text = "\n".join(str(m.content) for m in messages)
+        with self._lock:
+            delay = self._sample(self._rng)
+        reply = self._reply(text)
+        usage = {"input_tokens": len(text) // 4, "output_tokens": len(reply) // 4}
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        return delay, reply, usage
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        delay, reply, usage = self._prepare(messages)
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply, usage_metadata=usage))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        delay, reply, usage = self._prepare(messages)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply, usage_metadata=usage))])
+
+    @staticmethod
+    def _chunks(reply) -> Iterator[ChatGenerationChunk]:
+        parts = re.findall(r"\S+\s*", reply) or [reply]
+        for i in range(0, len(parts), 8):
+            yield ChatGenerationChunk(message=AIMessageChunk(content="".join(parts[i:i + 8])))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        delay, reply, _ = self._prepare(messages)
+        time.sleep(delay)
+        yield from self._chunks(reply)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        delay, reply, _ = self._prepare(messages)
+        await asyncio.sleep(delay)
+        for chunk in self._chunks(reply):
+            yield chunk
@@ -0,0 +1,117 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+# Status codes worth retrying: the MCP server is restarting or momentarily overloaded
+RETRYABLE_STATUS = {502, 503, 504}
+
+
+class MCPClient:
+    """
+    Async HTTP client for the MCP Producer Server.
+
+    Holds one keep-alive connection pool for the lifetime of the agent, applies
+    per-call timeouts and retries transient failures with jittered exponential
+    backoff. The capability list is cached for `capabilities_ttl` seconds and
+    revalidated with a conditional GET; any response carrying a different
+    X-MCP-Capabilities-Version header expires the cache immediately.
+    """
+
+    def __init__(self, base_url: str, client_config: Optional[Dict[str, Any]] = None):
+        cfg = client_config or {}
+        self.base_url = base_url
+        self.timeout = cfg.get('timeout', 30.0)
+        self.retries = cfg.get('retries', 2)
+        self.backoff = cfg.get('backoff', 0.2)
+        self.max_backoff = cfg.get('max_backoff', 2.0)
+        self.capabilities_ttl = cfg.get('capabilities_ttl', 300.0)
+        self._capabilities: Optional[List[str]] = None
+        self._capabilities_version: Optional[str] = None
+        self._capabilities_etag: Optional[str] = None
+        self._capabilities_expires = 0.0
+        self._capabilities_lock = asyncio.Lock()
+        self.capabilities_stats = {"hits": 0, "revalidated": 0, "fetched": 0}
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(self.timeout, connect=cfg.get('connect_timeout', 5.0)),
+            limits=httpx.Limits(
+                max_connections=cfg.get('max_connections', 50),
+                max_keepalive_connections=cfg.get('max_keepalive_connections', 20),
+                keepalive_expiry=cfg.get('keepalive_expiry', 30.0),
+            ),
+        )
+
+    def _observe_version(self, resp: httpx.Response):
+        version = resp.headers.get("x-mcp-capabilities-version")
+        if version and self._capabilities_version and version != self._capabilities_version:
+            self._capabilities_expires = 0.0
+            self._capabilities_etag = None
+
+    async def _request(self, method: str, path: str, timeout: Optional[float] = None,
+                       idempotent: bool = True, allow_status=(), **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                resp = await self._client.request(
+                    method, path, timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT, **kwargs
+                )
+                self._observe_version(resp)
+                if not idempotent or resp.status_code not in RETRYABLE_STATUS or attempt >= self.retries:
+                    if resp.status_code not in allow_status:
+                        resp.raise_for_status()
+                    return resp
+            except httpx.TransportError as e:
+                # Writes are only retried when the request never reached the server
+                if attempt >= self.retries or (not idempotent and not isinstance(e, httpx.ConnectError)):
+                    raise
+            attempt += 1
+            delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+            await asyncio.sleep(delay * (0.5 + random.random() / 2))
+
+    async def get_capabilities(self, timeout: Optional[float] = None) -> List[str]:
+        if self._capabilities is not None and time.monotonic() < self._capabilities_expires:
+            self.capabilities_stats["hits"] += 1
+            return self._capabilities
+
+        async with self._capabilities_lock:
+            # Another request may have refreshed the list while we waited
+            if self._capabilities is not None and time.monotonic() < self._capabilities_expires:
+                self.capabilities_stats["hits"] += 1
+                return self._capabilities
+
+            headers = {"If-None-Match": self._capabilities_etag} if self._capabilities_etag else {}
+            resp = await self._request("GET", "/capabilities", timeout=timeout, headers=headers, allow_status=(304,))
+            if resp.status_code == 304 and self._capabilities is not None:
+                self.capabilities_stats["revalidated"] += 1
+            else:
+                body = resp.json()
+                self._capabilities = body['capabilities']
+                self._capabilities_version = body.get('version') or resp.headers.get("x-mcp-capabilities-version")
+                self._capabilities_etag = resp.headers.get("etag")
+                self.capabilities_stats["fetched"] += 1
+            self._capabilities_expires = time.monotonic() + self.capabilities_ttl
+            return self._capabilities
+
+    async def call_tool(self, tool_name: str, params: Optional[Dict[str, Any]] = None,
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
+        resp = await self._request("GET", f"/tools/{tool_name}", params=params or {}, timeout=timeout)
+        return resp.json()
+
+    async def call_tools(self, calls: List[Dict[str, Any]], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Runs several tools in one round trip; each call is {"tool_name": ..., "param": ..., "id": ...}."""
+        resp = await self._request("POST", "/tools/batch", json={"calls": calls}, timeout=timeout)
+        return resp.json()['results']
+
+    async def log_decision(self, decision: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        resp = await self._request("POST", "/log", json=decision, timeout=timeout, idempotent=False)
+        return resp.json()
+
+    async def log_decisions(self, decisions: List[Dict[str, Any]], timeout: Optional[float] = None) -> Dict[str, Any]:
+        resp = await self._request("POST", "/log/batch", json={"decisions": decisions}, timeout=timeout, idempotent=False)
+        return resp.json()
+
+    async def aclose(self):
+        await self._client.aclose()
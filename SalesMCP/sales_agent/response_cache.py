@@ -0,0 +1,152 @@
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Decimal points stay inside numbers: "1.5m" and "15m" are different questions
+_WORD = re.compile(r"[a-z0-9$%]+(?:\.[0-9][a-z0-9$%]*)*")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercases, strips punctuation and collapses whitespace so trivial rephrasings share a key."""
+    return " ".join(_WORD.findall(question.lower()))
+
+
+def hashed_embedding(text: str, dims: int = 256) -> List[float]:
+    """
+    Cheap local embedding: unigrams and bigrams hashed into a fixed-size,
+    L2-normalised vector. Good enough to match near-duplicate questions
+    without calling an embedding API.
+    """
+    words = text.split()
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    vec = [0.0] * dims
+    for feat in features:
+        h = int.from_bytes(hashlib.blake2b(feat.encode(), digest_size=8).digest(), "little")
+        vec[h % dims] += 1.0 if (h >> 63) & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vec))
+    return [v / norm for v in vec] if norm else vec
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+class ResponseCache:
+    """
+    LRU cache of full /ask answers (intent, MCP evidence and recommendation).
+
+    Lookups try the normalised question text first and, when `semantic` is
+    enabled, fall back to the most similar cached question above
+    `similarity_threshold`. Each entry's TTL follows the freshness of the MCP
+    tool that produced it (`ttl_by_tool`). Entries are evicted least recently
+    used first once `max_entries` or the approximate `max_bytes` cap is hit.
+    """
+
+    def __init__(self, cache_config: Optional[Dict[str, Any]] = None):
+        cfg = cache_config or {}
+        self.enabled = cfg.get('enabled', True)
+        self.default_ttl = cfg.get('default_ttl', 300)
+        self.ttl_by_tool = cfg.get('ttl_by_tool') or {}
+        self.max_entries = cfg.get('max_entries', 1000)
+        self.max_bytes = cfg.get('max_bytes', 32 * 1024 * 1024)
+        self.semantic = cfg.get('semantic', False)
+        self.similarity_threshold = cfg.get('similarity_threshold', 0.92)
+        self.embedding_dims = cfg.get('embedding_dims', 256)
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "semantic_hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def _ttl_for(self, tool_names) -> float:
+        # Multi-tool answers are only as fresh as their most volatile tool
+        if isinstance(tool_names, str):
+            tool_names = [tool_names]
+        return min((self.ttl_by_tool.get(t, self.default_ttl) for t in tool_names), default=self.default_ttl)
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry["size"]
+
+    def _find_similar(self, embedding: List[float], now: float) -> Optional[Tuple[str, float]]:
+        best_key, best_score = None, self.similarity_threshold
+        for key, entry in self._entries.items():
+            if entry["expires_at"] <= now:
+                continue
+            score = _cosine(embedding, entry["embedding"])
+            if score >= best_score:
+                best_key, best_score = key, score
+        return (best_key, best_score) if best_key else None
+
+    def get(self, question: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        key = normalize_question(question)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["expires_at"] <= now:
+                self._drop(key)
+                self.stats["expired"] += 1
+                entry = None
+
+            match = "exact"
+            if entry is None and self.semantic and self._entries:
+                similar = self._find_similar(hashed_embedding(key, self.embedding_dims), now)
+                if similar:
+                    key, _ = similar
+                    entry = self._entries[key]
+                    match = "semantic"
+
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["semantic_hits" if match == "semantic" else "hits"] += 1
+            return {**entry["value"], "cache": {"hit": match, "age_s": round(now - entry["stored_at"], 3)}}
+
+    def put(self, question: str, tool_names, value: Dict[str, Any]):
+        if not self.enabled:
+            return
+        key = normalize_question(question)
+        size = len(key) + len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        now = time.monotonic()
+        entry = {
+            "value": value,
+            "size": size,
+            "stored_at": now,
+            "expires_at": now + self._ttl_for(tool_names),
+            "embedding": hashed_embedding(key, self.embedding_dims) if self.semantic else None,
+        }
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["semantic_hits"] + self.stats["misses"]
+            hits = self.stats["hits"] + self.stats["semantic_hits"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
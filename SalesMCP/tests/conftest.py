@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the service packages the way main.py does, from the SalesMCP directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("langchain_google_genai")
+
+from sales_agent.agent import Intent, SalesAgent, ToolCall
+
+
+class StubMCPClient:
+    """Answers tool calls from a table instead of the MCP server."""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    async def call_tool(self, tool_name, parameters):
+        self.calls.append((tool_name, parameters))
+        return self.results[tool_name](parameters)
+
+    async def call_tools(self, invocations):
+        if self.results.get("batch_error"):
+            raise RuntimeError(self.results["batch_error"])
+        out = []
+        for inv in invocations:
+            params = {k: inv[k] for k in ("id", "param") if inv[k] is not None}
+            self.calls.append((inv["tool_name"], params))
+            out.append({"tool_name": inv["tool_name"], "status": "ok", "result": self.results[inv["tool_name"]](params)})
+        return out
+
+
+def make_agent(results):
+    agent = SalesAgent.__new__(SalesAgent)
+    agent.max_plan_steps = 5
+    agent.max_fanout = 10
+    agent.mcp_client = StubMCPClient(results)
+    return agent
+
+
+def step(step_id, tool_name, depends_on=None, for_each=None):
+    return ToolCall(step_id=step_id, tool_name=tool_name, parameters={}, depends_on=depends_on,
+                    for_each=for_each, explanation="")
+
+
+def test_step_depending_on_fan_out_sees_its_results():
+    agent = make_agent({
+        "get_deals_by_owner": lambda p: {"deals": [{"id": 1}, {"id": 2}]},
+        "get_customer_profile": lambda p: {"recent_activities": [{"id": p["id"] * 10}]},
+        "evaluate_deal_risk": lambda p: {"deal_id": p["id"]},
+    })
+    intent = Intent(calls=[
+        step("s1", "get_deals_by_owner"),
+        step("s2", "get_customer_profile", depends_on="s1", for_each="deals.id"),
+        step("s3", "evaluate_deal_risk", depends_on="s2", for_each="recent_activities.id"),
+    ], explanation="")
+
+    evidence = asyncio.run(agent.execute_plan(intent))
+
+    assert "error" not in evidence["s3"]
+    assert [r["parameters"]["id"] for r in evidence["s3"]["results"]] == [10, 20]
+
+
+def test_duplicate_step_ids_are_rejected():
+    agent = make_agent({"get_stalled_deals": lambda p: {"deals": []}})
+    intent = Intent(calls=[step("s1", "get_stalled_deals"), step("s1", "get_stalled_deals")], explanation="")
+
+    evidence = asyncio.run(agent.execute_plan(intent))
+
+    assert "result" in evidence["s1"]
+    assert evidence["s1#1"]["error"] == "Duplicate step_id 's1'"
+    assert len(agent.mcp_client.calls) == 1
+
+
+def test_failed_fan_out_keeps_other_evidence():
+    agent = make_agent({
+        "get_deals_by_owner": lambda p: {"deals": [{"id": 1}]},
+        "get_stalled_deals": lambda p: {"deals": []},
+        "batch_error": "502 Bad Gateway",
+    })
+    intent = Intent(calls=[
+        step("s1", "get_deals_by_owner"),
+        step("s2", "evaluate_deal_risk", depends_on="s1", for_each="deals.id"),
+        step("s3", "get_stalled_deals"),
+    ], explanation="")
+
+    evidence = asyncio.run(agent.execute_plan(intent))
+
+    assert "502 Bad Gateway" in evidence["s2"]["error"]
+    assert "result" in evidence["s1"] and "result" in evidence["s3"]
+
+
+def test_fan_out_sends_names_as_param():
+    agent = make_agent({
+        "get_stalled_deals": lambda p: {"deals": [{"id": 7, "owner_name": "Alice Johnson"}]},
+        "get_deals_by_owner": lambda p: {"owner": p["param"], "deals": []},
+    })
+    intent = Intent(calls=[
+        step("s1", "get_stalled_deals"),
+        step("s2", "get_deals_by_owner", depends_on="s1", for_each="deals.owner_name"),
+    ], explanation="")
+
+    evidence = asyncio.run(agent.execute_plan(intent))
+
+    assert evidence["s2"]["results"][0]["parameters"] == {"param": "Alice Johnson"}
+    assert evidence["s2"]["results"][0]["result"]["owner"] == "Alice Johnson"
+
+
+def test_fan_out_rejects_values_the_tool_cannot_take():
+    agent = make_agent({"get_stalled_deals": lambda p: {"deals": [{"id": 7, "owner_name": "Alice Johnson"}]}})
+    intent = Intent(calls=[
+        step("s1", "get_stalled_deals"),
+        step("s2", "evaluate_deal_risk", depends_on="s1", for_each="deals.owner_name"),
+    ], explanation="")
+
+    evidence = asyncio.run(agent.execute_plan(intent))
+
+    assert "takes no argument" in evidence["s2"]["error"]
@@ -0,0 +1,14 @@
+from sales_agent.response_cache import normalize_question
+
+
+def test_normalize_strips_punctuation_and_case():
+    assert normalize_question("  Show ALICE's deals?! ") == normalize_question("show alice s deals")
+
+
+def test_normalize_keeps_decimal_points():
+    assert normalize_question("Deals over 1.5M?") == "deals over 1.5m"
+    assert normalize_question("deals over 1.5M") != normalize_question("deals over 15M")
+
+
+def test_normalize_drops_sentence_period():
+    assert normalize_question("Deals over 15M.") == normalize_question("deals over 15m")